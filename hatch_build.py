@@ -0,0 +1,61 @@
+"""Optional Cython compilation of the Pydantic model modules.
+
+Wheels are built pure-Python when Cython or a C compiler is unavailable.
+Editable installs always use the .py sources.
+"""
+import os
+import shutil
+import tempfile
+
+from hatchling.builders.hooks.plugin.interface import BuildHookInterface
+
+COMPILED_MODULES = [
+    "src/models/menu.py",
+    "src/models/requests.py",
+    "src/models/responses.py",
+]
+
+
+class CustomBuildHook(BuildHookInterface):
+    """Cythonize COMPILED_MODULES into a temporary directory and ship the extensions with the wheel"""
+
+    _build_dir = None
+
+    def initialize(self, version, build_data):
+        if self.target_name != "wheel" or version == "editable" or os.getenv("DELTA_MENU_PURE_PYTHON"):
+            return
+
+        # Keep generated .c files and extensions out of the source tree, where the
+        # extensions would shadow the .py modules they were built from
+        self._build_dir = tempfile.mkdtemp(prefix="delta-menu-build-")
+        try:
+            from Cython.Build import cythonize
+            from setuptools import Distribution
+            from setuptools.command.build_ext import build_ext
+
+            extensions = cythonize(
+                COMPILED_MODULES, language_level=3, build_dir=os.path.join(self._build_dir, "cython")
+            )
+            command = build_ext(Distribution({"ext_modules": extensions}))
+            command.build_lib = os.path.join(self._build_dir, "lib")
+            command.build_temp = os.path.join(self._build_dir, "temp")
+            command.ensure_finalized()
+            command.run()
+        except Exception as e:
+            self.app.display_warning(f"Skipping compiled models, building pure-Python wheel: {e}")
+            self._remove_build_dir()
+            return
+
+        build_data["pure_python"] = False
+        build_data["infer_tag"] = True
+        for extension in command.extensions:
+            extension_path = command.get_ext_fullpath(extension.name)
+            build_data["force_include"][extension_path] = os.path.relpath(extension_path, command.build_lib)
+
+    def finalize(self, version, build_data, artifact_path):
+        self._remove_build_dir()
+
+    def _remove_build_dir(self):
+        if self._build_dir:
+            shutil.rmtree(self._build_dir, ignore_errors=True)
+            self._build_dir = None
@@ -1,4 +1,5 @@
 import asyncio
+import logging
 import os
 from datetime import datetime
 from typing import Dict, Any, List
@@ -8,13 +9,11 @@ from dotenv import load_dotenv
 from openai import AsyncOpenAI
 from openai.types.responses import ResponseTextDeltaEvent
 
-from ..client.delta_client import DeltaMenuClient
+from ..client.delta_client import DeltaMenuClient, close_http_client
 from ..tools.debug_tools import DebugTools
 from ..tools.menu_tools import MenuTools
-from ..utils.logging_config import setup_logging, get_logger
+from ..utils.logging_config import get_logger
 
-# Setup logging
-setup_logging(log_file='gradio_app.log')
 logger = get_logger(__name__)
 
 # Load environment variables
@@ -61,12 +60,13 @@ class MenuAgent:
             model=kimi_model,
             model_settings=ModelSettings(temperature=0.2, include_usage=True),
             tools=[
-                self.menu_tools.get_menu_by_flight_tool(),
-                self.menu_tools.check_menu_availability_tool(),
-                self.menu_tools.lookup_flights_tool()
+                self.menu_tools.get_menu_by_flight_tool,
+                self.menu_tools.get_menus_by_flights_tool,
+                self.menu_tools.check_menu_availability_tool,
+                self.menu_tools.lookup_flights_tool
             ]
         )
-        logger.info("MenuAgent initialized successfully with 3 tools")
+        logger.info("MenuAgent initialized successfully with 4 tools")
 
     
     def get_session(self, session_id: str) -> SQLiteSession:
@@ -77,19 +77,22 @@ class MenuAgent:
     async def process_message(self, message: str, session_id: str = "default") -> Dict[str, Any]:
         """Process a message using session-based context management"""
         try:
-            logger.info(f"Processing message with session {session_id}: {message[:100]}...")
+            logger.info("Processing message with session %s: %s...", session_id, message[:100])
             
             # Get or create session
             session = self.get_session(session_id)
             
             # Log existing session context before processing
             existing_items = await session.get_items()
-            logger.info(f"Session {session_id} - Existing context items: {len(existing_items)}")
-            for i, item in enumerate(existing_items[-5:]):  # Log last 5 items
-                logger.debug(f"Session {session_id} - Context[{i}]: {item.get('role', 'unknown')} - {str(item.get('content', ''))[:100]}...")
+            logger.info("Session %s - Existing context items: %s", session_id, len(existing_items))
+            # str() of a tool output can be a whole menu, so only build these previews at DEBUG
+            debug_enabled = logger.isEnabledFor(logging.DEBUG)
+            if debug_enabled:
+                for i, item in enumerate(existing_items[-5:]):  # Log last 5 items
+                    logger.debug("Session %s - Context[%s]: %s - %s...", session_id, i, item.get('role', 'unknown'), str(item.get('content', ''))[:100])
             
             # Run agent with session for automatic context management
-            logger.debug(f"Session {session_id} - Sending to agent: {message[:200]}...")
+            logger.debug("Session %s - Sending to agent: %s...", session_id, message[:200])
             result = await Runner.run(
                 self.agent,
                 message,
@@ -98,17 +101,17 @@ class MenuAgent:
             
             # Log new session context after processing
             new_items = await session.get_items()
-            logger.info(f"Session {session_id} - New context items: {len(new_items)} (added {len(new_items) - len(existing_items)} items)")
-            if len(new_items) > len(existing_items):
+            logger.info("Session %s - New context items: %s (added %s items)", session_id, len(new_items), len(new_items) - len(existing_items))
+            if debug_enabled and len(new_items) > len(existing_items):
                 for item in new_items[len(existing_items):]:
-                    logger.debug(f"Session {session_id} - Added: {item.get('role', 'unknown')} - {str(item.get('content', ''))[:100]}...")
+                    logger.debug("Session %s - Added: %s - %s...", session_id, item.get('role', 'unknown'), str(item.get('content', ''))[:100])
             
             # Log usage information
             if result.context_wrapper.usage:
                 usage = result.context_wrapper.usage
-                logger.info(f"Session {session_id} - Usage: {usage.total_tokens} total tokens, {usage.requests} requests, {usage.input_tokens} input tokens, {usage.output_tokens} output tokens")
+                logger.info("Session %s - Usage: %s total tokens, %s requests, %s input tokens, %s output tokens", session_id, usage.total_tokens, usage.requests, usage.input_tokens, usage.output_tokens)
             
-            logger.info(f"Agent response generated successfully for session {session_id}")
+            logger.info("Agent response generated successfully for session %s", session_id)
             
             return {
                 "response": result.final_output,
@@ -119,7 +122,7 @@ class MenuAgent:
             }
             
         except Exception as e:
-            logger.error(f"Error processing message: {str(e)}")
+            logger.error("Error processing message: %s", e)
             return {
                 "response": "I apologize, but I encountered an error processing your request. Please try again.",
                 "error": str(e)
@@ -152,10 +155,10 @@ class MenuAgent:
             # Log usage information after streaming completes
             if result.context_wrapper.usage:
                 usage = result.context_wrapper.usage
-                logger.info(f"Session {session_id} - Streaming Usage: {usage.total_tokens} total tokens, {usage.requests} requests, {usage.input_tokens} input tokens, {usage.output_tokens} output tokens")
+                logger.info("Session %s - Streaming Usage: %s total tokens, %s requests, %s input tokens, %s output tokens", session_id, usage.total_tokens, usage.requests, usage.input_tokens, usage.output_tokens)
 
         except Exception as e:
-            logger.error(f"Error processing streaming message: {str(e)}")
+            logger.error("Error processing streaming message: %s", e)
             yield f"I encountered an error: {str(e)}"
     
     async def clear_session(self, session_id: str = "default") -> None:
@@ -164,14 +167,14 @@ class MenuAgent:
         
         # Log items before clearing
         items_before = await session.get_items()
-        logger.info(f"Session {session_id} - Clearing {len(items_before)} items from session")
+        logger.info("Session %s - Clearing %s items from session", session_id, len(items_before))
         
         await session.clear_session()
         
         # Verify clearing worked
         items_after = await session.get_items()
-        logger.info(f"Session {session_id} - Cleared successfully. Items remaining: {len(items_after)}")
-        logger.info(f"Cleared session: {session_id}")
+        logger.info("Session %s - Cleared successfully. Items remaining: %s", session_id, len(items_after))
+        logger.info("Cleared session: %s", session_id)
     
     def _get_system_instructions(self) -> str:
         """System instructions for the agent"""
@@ -202,6 +205,7 @@ When users ask for specific cabin classes, use these cabin codes with the cabin_
 - When user asks for menu information, be conversational and helpful:
   * If they provide flight number, departure date, and departure airport - get the menu directly
   * If they provide departure/arrival airports and date but no flight number - use lookup_flights to show options
+  * If they want menus for several flights or dates at once - use get_menus_by_flights in a single call
   * If they're missing key information, ask for it politely
 - ABSOLUTELY CRITICAL: ALWAYS call the appropriate tool - NEVER assume menu availability without checking
 - ABSOLUTELY CRITICAL: ONLY provide menu information that comes directly from tool responses - NEVER make up or invent menu details
@@ -274,5 +278,7 @@ The preselect window will open on September 23rd, 2025 and will close on Septemb
     async def close(self):
         """Clean up resources"""
         logger.info("Closing MenuAgent resources")
+        await self.menu_tools.close()
         await self.client.close()
+        await close_http_client()
         logger.debug("MenuAgent resources closed")
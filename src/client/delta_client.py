@@ -1,24 +1,54 @@
+import asyncio
+import importlib.util
+import random
 import time
+from collections import OrderedDict
 from datetime import date
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Awaitable, Callable, Hashable, Optional
 
 import httpx
+from pydantic import ValidationError
+from pydantic_core import from_json
 
 from .oauth_manager import DeltaOAuthManager
-from ..data.ssr_codes import get_ssr_description
 from ..database.connection_pool import initialize_db_pool, close_db_pool
 from ..database.flight_repository import FlightRepository
 from ..models.menu import FlightMenuResponse, MenuAvailabilityResponse, \
-    FlightLeg, FlightMenuError
+    FlightLeg, FlightMenuError, FlightMenusPayload
 from ..models.requests import MenuQueryRequest, FlightRequestValidation, ValidationParameters, ValidationNextSteps, \
     FlightLookupRequest
 from ..models.responses import FlightLookupResponse
-from ..utils.logging_config import setup_logging, get_logger
+from ..utils.logging_config import get_logger
 
-# Setup logging
-setup_logging(log_file='gradio_app.log')
 logger = get_logger(__name__)
 
+# Shared connection pool so every DeltaMenuClient reuses keep-alive TLS connections;
+# HTTP/2 multiplexing is used when the optional h2 package is installed
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the process-wide HTTP client, creating it on first use"""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            headers=DeltaMenuClient.DEFAULT_HEADERS,
+            timeout=30.0,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=300),
+            http2=HTTP2_AVAILABLE
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the process-wide HTTP client; call once on application shutdown"""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
 class DeltaMenuClient:
     """Client for interacting with Delta's flight menu API"""
     
@@ -35,20 +65,49 @@ class DeltaMenuClient:
         'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
     }
     
-    def __init__(self, oauth_manager: Optional[DeltaOAuthManager] = None):
+    MENU_CACHE_SIZE = 4096
+    MENU_CACHE_TTL = 600.0
+    AVAILABILITY_CACHE_TTL = 60.0
+    NEGATIVE_CACHE_TTL = 30.0
+    # Client errors are answers about the request itself (e.g. unknown flight), so they are negative-cached too
+    UNCACHEABLE_ERROR_STATUS_CODES = frozenset({401, 403, 408, 429})
+
+    # Connection drops and gateway errors are retried; read timeouts already waited the full timeout
+    MAX_ATTEMPTS = 3
+    RETRY_BASE_DELAY = 0.1
+    RETRYABLE_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.RemoteProtocolError)
+    RETRYABLE_STATUS_CODES = frozenset({502, 503, 504})
+
+    # Menu bodies above this size are validated in a worker thread so the event loop stays responsive
+    THREADED_PARSE_MIN_BYTES = 256 * 1024
+
+    def __init__(self, oauth_manager: Optional[DeltaOAuthManager] = None,
+                 http_client: Optional[httpx.AsyncClient] = None):
         logger.info("Initializing DeltaMenuClient")
-        self.client = httpx.AsyncClient(
-            headers=self.DEFAULT_HEADERS,
-            timeout=30.0
-        )
+        self.client = http_client or get_http_client()
         self.oauth_manager = oauth_manager or DeltaOAuthManager()
         self.flight_repository = FlightRepository()
         self._db_initialized = False
+        # LRU caches of (expires_at, response)
+        self._menu_cache: OrderedDict[MenuQueryRequest, tuple[float, FlightMenuResponse | FlightMenuError]] = OrderedDict()
+        self._availability_cache: OrderedDict[tuple, tuple[float, MenuAvailabilityResponse]] = OrderedDict()
+        # Pending fetches by key; concurrent cache misses for one key all await the same task
+        # and get its outcome, including uncached failures
+        self._inflight_fetches: dict[Hashable, asyncio.Task] = {}
     
     async def get_menu_by_flight(self, request: MenuQueryRequest) -> FlightMenuResponse | FlightMenuError:
         """Get menu for specific flight"""
-        logger.info(f"Getting menu for flight {request.operating_carrier}{request.flight_number} on {request.departure_date} from {request.departure_airport}")
-        
+        logger.info("Getting menu for flight %s%s on %s from %s", request.operating_carrier, request.flight_number, request.departure_date, request.departure_airport)
+
+        cached = self._cache_get(self._menu_cache, request)
+        if cached is not None:
+            logger.debug("Menu cache hit")
+            return cached
+
+        return await self._single_flight(request, lambda: self._fetch_menu(request))
+
+    async def _fetch_menu(self, request: MenuQueryRequest) -> FlightMenuResponse | FlightMenuError:
+        """Fetch a menu from the API and cache the parsed result"""
         try:
             start_time = time.time()
             
@@ -58,7 +117,7 @@ class DeltaMenuClient:
                 'flightNum': request.flight_number,
                 'operatingCarrierCode': request.operating_carrier
             }
-            logger.debug(f"API request params: {params}")
+            logger.debug("API request params: %s", params)
             
             # Generate transaction ID
             import uuid
@@ -67,29 +126,37 @@ class DeltaMenuClient:
             headers = self.DEFAULT_HEADERS.copy()
             headers['transactionid'] = transaction_id
 
-            response = await self.client.get(
+            response = await self._send_with_retry(
+                "GET",
                 f"{self.BASE_URL}/menuByFlight",
                 params=params,
                 headers=headers
             )
             
             response_time_ms = int((time.time() - start_time) * 1000)
-            logger.info(f"API response received: {response.status_code} ({response_time_ms}ms)")
+            logger.info("API response received: %s (%sms)", response.status_code, response_time_ms)
             
             if response.status_code == 200:
-                data = response.json()
-                logger.debug(f"Response data keys: {list(data.keys()) if isinstance(data, dict) else 'Not a dict'}")
-                return self._parse_api_response(data, request, response_time_ms)
+                if len(response.content) >= self.THREADED_PARSE_MIN_BYTES:
+                    result = await asyncio.to_thread(self._parse_api_response, response.content, request, response_time_ms)
+                else:
+                    result = self._parse_api_response(response.content, request, response_time_ms)
+                self._cache_put(self._menu_cache, request, result,
+                                self.MENU_CACHE_TTL if result.success else self.NEGATIVE_CACHE_TTL)
+                return result
             else:
-                data = response.json()
-                logger.warning(f"API returned non-200 status: {response.status_code} - {data}")
-                return FlightMenuError(
+                data = from_json(response.content)
+                logger.warning("API returned non-200 status: %s - %s", response.status_code, data)
+                result = FlightMenuError(
                     success=False,
                     error_message=f"API returned {data}",
                 )
+                if self._is_cacheable_error(response.status_code):
+                    self._cache_put(self._menu_cache, request, result, self.NEGATIVE_CACHE_TTL)
+                return result
                 
         except httpx.TimeoutException:
-            logger.error(f"API request timed out for flight {request.operating_carrier}{request.flight_number}")
+            logger.error("API request timed out for flight %s%s", request.operating_carrier, request.flight_number)
             return FlightMenuResponse(
                 operating_carrier_code=request.operating_carrier,
                 flight_num=request.flight_number,
@@ -99,23 +166,90 @@ class DeltaMenuClient:
                 error_message="Request timed out",
                 api_response_time_ms=30000
             )
+        except httpx.HTTPError as e:
+            logger.error("API request failed for flight %s%s: %r", request.operating_carrier, request.flight_number, e)
+            return FlightMenuError(
+                success=False,
+                error_message=f"Request failed: {e}"
+            )
         except Exception as e:
-            logger.error(f"Unexpected error in get_menu_by_flight: {str(e)}", exc_info=True)
+            logger.error("Unexpected error in get_menu_by_flight: %s", e, exc_info=True)
             return FlightMenuError(
                 success=False,
                 error_message=str(e)
             )
+
+    async def _send_with_retry(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """Send a request, retrying transient failures with jittered exponential backoff"""
+        for attempt in range(1, self.MAX_ATTEMPTS + 1):
+            try:
+                response = await self.client.request(method, url, **kwargs)
+                if response.status_code not in self.RETRYABLE_STATUS_CODES or attempt == self.MAX_ATTEMPTS:
+                    return response
+                logger.warning("%s %s returned %s (attempt %s), retrying", method, url, response.status_code, attempt)
+            except self.RETRYABLE_ERRORS as e:
+                if attempt == self.MAX_ATTEMPTS:
+                    raise
+                logger.warning("%s %s failed with %r (attempt %s), retrying", method, url, e, attempt)
+            await asyncio.sleep(self.RETRY_BASE_DELAY * 2 ** (attempt - 1) * (0.5 + random.random()))
+    
+    def _single_flight(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Awaitable[Any]:
+        """Join the pending fetch for key, starting one when none is in flight.
+
+        The fetch runs in its own task and each caller awaits it through asyncio.shield, so
+        cancelling one caller does not cancel the fetch for the others.
+        """
+        task = self._inflight_fetches.get(key)
+        if task is None:
+            task = asyncio.create_task(fetch())
+            self._inflight_fetches[key] = task
+            task.add_done_callback(lambda done: self._inflight_fetches.pop(key, None)
+                                   if self._inflight_fetches.get(key) is done else None)
+        else:
+            logger.debug("Joining in-flight fetch for %s", key)
+        return asyncio.shield(task)
+
+    @classmethod
+    def _is_cacheable_error(cls, status_code: int) -> bool:
+        """Whether a non-200 status describes the request rather than a transient or auth problem"""
+        return 400 <= status_code < 500 and status_code not in cls.UNCACHEABLE_ERROR_STATUS_CODES
+
+    @staticmethod
+    def _cache_get(cache: OrderedDict, key: Hashable) -> Any:
+        """Return an unexpired cached response, or None on a miss"""
+        entry = cache.get(key)
+        if entry is None:
+            return None
+        expires_at, response = entry
+        if expires_at <= time.monotonic():
+            del cache[key]
+            return None
+        cache.move_to_end(key)
+        return response
+
+    def _cache_put(self, cache: OrderedDict, key: Hashable, response: Any, ttl: float) -> None:
+        """Store a response for ttl seconds, evicting the least recently used entry when full"""
+        cache[key] = (time.monotonic() + ttl, response)
+        cache.move_to_end(key)
+        if len(cache) > self.MENU_CACHE_SIZE:
+            cache.popitem(last=False)
     
-    def _parse_api_response(self, data: Dict[str, Any], request: MenuQueryRequest, response_time_ms: int) -> FlightMenuResponse | FlightMenuError:
-        """Parse the Delta API response into our Pydantic models"""
+    def _parse_api_response(self, content: bytes, request: MenuQueryRequest, response_time_ms: int) -> FlightMenuResponse | FlightMenuError:
+        """Parse the Delta API response body straight into our Pydantic models"""
         logger.debug("Parsing API response")
         
         try:
-            if not data or not data.get('flightMenus'):
-                error_message = "Empty or invalid response from API"
-                if isinstance(data, dict) and 'error' in data:
-                    error_message = data['error']
-                logger.warning(f"Invalid API response: {error_message}")
+            # Validating the raw bytes skips building an intermediate dict of the whole menu
+            try:
+                payload = FlightMenusPayload.model_validate_json(content)
+            except ValidationError:
+                # Falsy bodies such as [] or null are empty responses, not parse failures
+                if not self._is_empty_json(content):
+                    raise
+                payload = FlightMenusPayload()
+            if not payload.flight_menus:
+                error_message = payload.error or "Empty or invalid response from API"
+                logger.warning("Invalid API response: %s", error_message)
                 return FlightMenuResponse(
                     operating_carrier_code=request.operating_carrier,
                     flight_num=request.flight_number,
@@ -126,42 +260,27 @@ class DeltaMenuClient:
                     api_response_time_ms=response_time_ms
                 )
 
-            flight_menu_data = data['flightMenus'][0]
-            logger.debug(f"Found flight menu data with keys: {list(flight_menu_data.keys())}")
-
-            # Add SSR descriptions to menu items
-            self._add_ssr_descriptions(flight_menu_data)
-            
-            flight_menu_response = FlightMenuResponse.model_validate({
-                **flight_menu_data,
-                'success': True,
-                'error_message': None,
-                'api_response_time_ms': response_time_ms
-            })
-            logger.info(f"Successfully parsed menu response for {request.operating_carrier}{request.flight_number}")
+            # SSR descriptions are added to menu items by MenuItem's validator
+            flight_menu_response = payload.flight_menus[0]
+            flight_menu_response.api_response_time_ms = response_time_ms
+            logger.info("Successfully parsed menu response for %s%s", request.operating_carrier, request.flight_number)
             return flight_menu_response
 
         except Exception as e:
-            logger.error(f"Error parsing API response: {str(e)}", exc_info=True)
+            logger.error("Error parsing API response: %s", e, exc_info=True)
             return FlightMenuError(
                 success=False,
                 error_message=f"An unexpected error occurred during parsing: {str(e)}",
             )
-    
-    def _add_ssr_descriptions(self, flight_menu_data: Dict[str, Any]):
-        """Add SSR code descriptions to menu items"""
-        for menu_service in flight_menu_data.get('menuServices', []):
-            for menu in menu_service.get('menus', []):
-                for menu_item in menu.get('menuItems', []):
-                    ssr_code = menu_item.get('ssrCode')
-                    if ssr_code:
-                        description = get_ssr_description(ssr_code)
-                        dietary_asgmts = menu_item.get('menuItemDietaryAsgmts')
 
-                        if not dietary_asgmts:
-                            new_asgmt = {'menuItemDietaryDesc': description}
-                            menu_item['menuItemDietaryAsgmts'] = [new_asgmt]
 
+    @staticmethod
+    def _is_empty_json(content: bytes) -> bool:
+        """Whether the body is valid JSON with a falsy top-level value ([], {}, null, "")"""
+        try:
+            return not from_json(content)
+        except ValueError:
+            return False
 
     def validate_flight_request(self, request: MenuQueryRequest) -> FlightRequestValidation:
         """
@@ -187,8 +306,8 @@ class DeltaMenuClient:
             issues.append("Departure date is more than 1 year in the future")
             recommendations.append("Menu data may not be available for flights more than 1 year ahead")
 
-        # Validate flight number (already validated by Pydantic)
-        if request.flight_number > 9999:
+        # Validate flight number (tools build requests with model_construct, so check the full range)
+        if not 1 <= request.flight_number <= 9999:
             issues.append("Invalid flight number")
             recommendations.append("Flight number should be between 1 and 9999")
 
@@ -244,15 +363,36 @@ class DeltaMenuClient:
     
     async def check_menu_availability(self, flight_legs: list[FlightLeg]) -> MenuAvailabilityResponse:
         """Check menu availability for flights using OAuth authentication"""
+        key = tuple(
+            (leg.operating_carrier_code, leg.flight_num, leg.flight_departure_airport_code, leg.departure_local_date)
+            for leg in flight_legs
+        )
+        cached = self._cache_get(self._availability_cache, key)
+        if cached is not None:
+            logger.debug("Availability cache hit")
+            return cached
+
+        return await self._single_flight(key, lambda: self._fetch_availability(key))
+
+    async def _fetch_availability(self, key: tuple) -> MenuAvailabilityResponse:
+        """Fetch menu availability from the API and cache the parsed result"""
         start_time = time.time()
         
         try:
             # Get OAuth token
             access_token = await self.oauth_manager.get_access_token()
             
-            # Prepare request data
+            # Prepare request data; the cache key already holds each leg's fields in API order
             request_data = {
-                "flightLegs": [leg.model_dump(by_alias=True) for leg in flight_legs]
+                "flightLegs": [
+                    {
+                        "operatingCarrierCode": carrier,
+                        "flightNum": flight_num,
+                        "flightDepartureAirportCode": airport,
+                        "departureLocalDate": departure_date
+                    }
+                    for carrier, flight_num, airport, departure_date in key
+                ]
             }
             
             # Generate transaction ID
@@ -268,7 +408,8 @@ class DeltaMenuClient:
                 'Content-Type': 'application/json'
             }
             
-            response = await self.client.post(
+            response = await self._send_with_retry(
+                "POST",
                 f"{self.BASE_URL}/digitalMenuAvailability",
                 json=request_data,
                 headers=headers
@@ -277,15 +418,21 @@ class DeltaMenuClient:
             response_time_ms = int((time.time() - start_time) * 1000)
             
             if response.status_code == 200:
-                data = response.json()
-                return self._parse_availability_response(data, response_time_ms)
+                data = from_json(response.content)
+                result = self._parse_availability_response(data, response_time_ms)
+                self._cache_put(self._availability_cache, key, result,
+                                self.AVAILABILITY_CACHE_TTL if result.success else self.NEGATIVE_CACHE_TTL)
+                return result
             else:
-                return MenuAvailabilityResponse(
+                result = MenuAvailabilityResponse(
                     flight_legs=[],
                     success=False,
                     error_message=f"Availability API returned status code {response.status_code}",
                     api_response_time_ms=response_time_ms
                 )
+                if self._is_cacheable_error(response.status_code):
+                    self._cache_put(self._availability_cache, key, result, self.NEGATIVE_CACHE_TTL)
+                return result
                 
         except httpx.TimeoutException:
             return MenuAvailabilityResponse(
@@ -294,6 +441,12 @@ class DeltaMenuClient:
                 error_message="Availability request timed out",
                 api_response_time_ms=30000
             )
+        except httpx.HTTPError as e:
+            return MenuAvailabilityResponse(
+                flight_legs=[],
+                success=False,
+                error_message=f"Availability request failed: {e}"
+            )
         except Exception as e:
             return MenuAvailabilityResponse(
                 flight_legs=[],
@@ -325,15 +478,20 @@ class DeltaMenuClient:
     
     async def lookup_flights(self, request: FlightLookupRequest) -> FlightLookupResponse:
         """Lookup flight numbers by route and date using Oracle database"""
-        logger.info(f"Looking up flights from {request.departure_airport} to {request.arrival_airport} on {request.departure_date}")
-        
+        logger.info("Looking up flights from %s to %s on %s", request.departure_airport, request.arrival_airport, request.departure_date)
+
+        # Flight lookups are not cached, so only concurrent identical lookups share a query
+        return await self._single_flight(request, lambda: self._lookup_flights(request))
+
+    async def _lookup_flights(self, request: FlightLookupRequest) -> FlightLookupResponse:
+        """Query the flight repository, converting failures into an unsuccessful response"""
         try:
             await self._ensure_db_initialized()
             return await self.flight_repository.lookup_flights(request)
             
         except ValueError as e:
             # Handle missing credentials gracefully
-            logger.error(f"Database configuration error: {str(e)}")
+            logger.error("Database configuration error: %s", e)
             return FlightLookupResponse(
                 departure_airport=request.departure_airport,
                 arrival_airport=request.arrival_airport,
@@ -344,7 +502,7 @@ class DeltaMenuClient:
                 error_message=f"Database configuration error: {str(e)}"
             )
         except Exception as e:
-            logger.error(f"Error looking up flights: {str(e)}", exc_info=True)
+            logger.error("Error looking up flights: %s", e, exc_info=True)
             return FlightLookupResponse(
                 departure_airport=request.departure_airport,
                 arrival_airport=request.arrival_airport,
@@ -356,11 +514,16 @@ class DeltaMenuClient:
             )
     
     async def close(self):
-        """Close the HTTP client and database pool"""
+        """Close the OAuth client and database pool; the shared HTTP client is closed by close_http_client"""
         logger.info("Closing DeltaMenuClient")
-        await self.client.aclose()
         if hasattr(self, 'oauth_manager'):
             await self.oauth_manager.close()
         if self._db_initialized:
             await close_db_pool()
-        logger.debug("DeltaMenuClient closed")
\ No newline at end of file
+        logger.debug("DeltaMenuClient closed")
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
\ No newline at end of file
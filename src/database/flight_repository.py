@@ -11,7 +11,7 @@ class FlightRepository:
     
     async def lookup_flights(self, request: FlightLookupRequest) -> FlightLookupResponse:
         """Query database for flights matching the route and date"""
-        logger.info(f"Querying flights: {request.departure_airport} to {request.arrival_airport} on {request.departure_date}")
+        logger.info("Querying flights: %s to %s on %s", request.departure_airport, request.arrival_airport, request.departure_date)
         
         try:
             with (await get_db_connection()) as connection:
@@ -38,7 +38,7 @@ class FlightRepository:
                 })
                 
                 rows = cursor.fetchall()
-                logger.debug(f"Query returned {len(rows)} flights")
+                logger.debug("Query returned %s flights", len(rows))
                 
                 flights = [
                     FlightOption(
@@ -61,7 +61,7 @@ class FlightRepository:
                 )
                 
         except Exception as e:
-            logger.error(f"Database query failed: {str(e)}", exc_info=True)
+            logger.error("Database query failed: %s", e, exc_info=True)
             return FlightLookupResponse(
                 departure_airport=request.departure_airport,
                 arrival_airport=request.arrival_airport,
@@ -7,8 +7,6 @@ import gradio as gr
 from ..agents.menu_agent import MenuAgent
 from ..utils.logging_config import setup_logging, get_logger
 
-# Setup logging
-setup_logging(log_file='gradio_app.log')
 logger = get_logger(__name__)
 
 
@@ -20,14 +18,14 @@ class GradioInterface:
     
     async def chat_response_stream(self, message: str, session_id: str = "gradio_session", debug_mode: bool = False):
         """Process chat message with streaming using session-based management"""
-        logger.info(f"Processing message: {message[:100]}...")
+        logger.info("Processing message: %s...", message[:100])
         try:
             # Use session-based streaming - no need to manage history manually
             async for partial_response in self.agent.process_message_stream(message, session_id):
                 yield partial_response
                 
         except Exception as e:
-            logger.error(f"Error processing message: {str(e)}", exc_info=True)
+            logger.error("Error processing message: %s", e, exc_info=True)
             error_msg = f"I encountered an error: {str(e)}"
             if debug_mode:
                 error_msg += f"\n\nDebug: {str(e)}"
@@ -209,6 +207,9 @@ def create_simple_chat():
 
 # Main entry point
 if __name__ == "__main__":
+    # Setup logging once for the whole application
+    setup_logging(log_file='gradio_app.log')
+    
     # Check for required environment variables
     if not os.getenv("KIMI_API_KEY"):
         logger.warning("KIMI_API_KEY not found in environment variables")
@@ -1,48 +1,81 @@
-from typing import List, Optional, Dict
+# cython: language_level=3
+import sys
+from functools import cached_property
+from typing import Any
 
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, field_validator, model_validator
 
+from src.data.ssr_codes import get_ssr_description
 from src.utils.utils import to_camel
 
 
+class InternedStringsBase(BaseModel):
+    """Base for models whose low-cardinality code fields are interned at validation time"""
+
+    @field_validator("cabin_type_code", mode="after", check_fields=False)
+    @classmethod
+    def _normalize_cabin_code(cls, v: str | None) -> str | None:
+        # Uppercase once at ingest so cabin filters can compare directly
+        return sys.intern(v.upper()) if v else v
+
+    @field_validator("operating_carrier_code", mode="after", check_fields=False)
+    @classmethod
+    def _intern_code(cls, v: str | None) -> str | None:
+        return sys.intern(v) if v else v
+
+    @field_validator("lang_codes", mode="after", check_fields=False)
+    @classmethod
+    def _intern_lang_codes(cls, v: tuple[str, ...]) -> tuple[str, ...]:
+        return tuple(map(sys.intern, v))
+
+
 class DigitalMenuItemDietaryAsgmt(BaseModel):
     """Menu item dietary assignment"""
     model_config = ConfigDict(alias_generator=to_camel)
-    # menu_item_dietary_code: Optional[str] = None
-    menu_item_dietary_desc: Optional[str] = Field(None, examples=["Vegetarian", "Gluten-free Meal", "Vegan" ])
+    # menu_item_dietary_code: str | None = None
+    menu_item_dietary_desc: str | None = Field(None, examples=["Vegetarian", "Gluten-free Meal", "Vegan" ])
 
 
 class MenuServicePreferences(BaseModel):
     """Menu service preferences"""
     model_config = ConfigDict(alias_generator=to_camel)
-    menu_service_preference_code: Optional[str] = None
-    menu_service_preference_desc: Optional[str] = None
-    menu_service_preference_addl_desc: Optional[str] = None
+    menu_service_preference_code: str | None = None
+    menu_service_preference_desc: str | None = None
+    menu_service_preference_addl_desc: str | None = None
 
 
 class MenuItem(BaseModel):
     """Individual menu item with details"""
     model_config = ConfigDict(alias_generator=to_camel)
-    # menu_item_id: Optional[int] = None
-    # product_id: Optional[str] = None
-    # menu_rrd_product_id: Optional[str] = None
-    # menu_item_type_cd: Optional[str] = None
-    menu_item_type_name: Optional[str] = Field(None, examples=["Bread", "Appetizer", "Main Course", "Wines"])
-    # menu_item_type_disp_ord_seq_num: Optional[int] = None
-    # menu_item_disp_ord_seq_num: Optional[int] = None
-    menu_item_desc: Optional[str] = None
-    menu_item_additional_desc: Optional[str] = None
-    # menu_item_offer_type_code: Optional[str] = None
-    menu_item_offer_type_desc: Optional[str] = None
-    menu_item_offer_info: Optional[str] = None
-    # menu_item_image_url_addr: Optional[str] = None
-    menu_item_dietary_asgmts: List[DigitalMenuItemDietaryAsgmt] = Field(default_factory=list)
-    # menu_item_notes_text: Optional[str] = None
-    ssr_code: Optional[str] = Field(None, description="Special Service Request code")
-    pre_select_meal: Optional[bool] = Field(None, description="Whether meal can be pre-selected")
-    # paxia_recipe_spec_code: Optional[str] = None
-    # menu_item_effective_date: Optional[str] = None
-    # menu_item_expiry_date: Optional[str] = None
+    # menu_item_id: int | None = None
+    # product_id: str | None = None
+    # menu_rrd_product_id: str | None = None
+    # menu_item_type_cd: str | None = None
+    menu_item_type_name: str | None = Field(None, examples=["Bread", "Appetizer", "Main Course", "Wines"])
+    # menu_item_type_disp_ord_seq_num: int | None = None
+    # menu_item_disp_ord_seq_num: int | None = None
+    menu_item_desc: str | None = None
+    menu_item_additional_desc: str | None = None
+    # menu_item_offer_type_code: str | None = None
+    menu_item_offer_type_desc: str | None = None
+    menu_item_offer_info: str | None = None
+    # menu_item_image_url_addr: str | None = None
+    menu_item_dietary_asgmts: list[DigitalMenuItemDietaryAsgmt] = Field(default_factory=list)
+    # menu_item_notes_text: str | None = None
+    ssr_code: str | None = Field(None, description="Special Service Request code")
+    pre_select_meal: bool | None = Field(None, description="Whether meal can be pre-selected")
+    # paxia_recipe_spec_code: str | None = None
+    # menu_item_effective_date: str | None = None
+    # menu_item_expiry_date: str | None = None
+
+    @model_validator(mode="after")
+    def _describe_ssr_code(self) -> "MenuItem":
+        """Give SSR-coded items without dietary assignments the SSR code's description"""
+        if self.ssr_code and not self.menu_item_dietary_asgmts:
+            self.menu_item_dietary_asgmts.append(DigitalMenuItemDietaryAsgmt.model_construct(
+                menu_item_dietary_desc=get_ssr_description(self.ssr_code)
+            ))
+        return self
 
 
 
@@ -50,11 +83,11 @@ class MenuItem(BaseModel):
 class Menu(BaseModel):
     """Individual menu within a cabin (e.g., Lunch, Dinner, Snacks, Beverages)"""
     model_config = ConfigDict(alias_generator=to_camel)
-    # menu_id: Optional[int] = None
-    # menu_course_type_code: Optional[str] = None
-    menu_course_type_desc: Optional[str] = Field(None, examples=["Meal", "Snacks", "Beverages"])
-    # menu_service_type_code: Optional[str] = None
-    menu_service_type_desc: Optional[str] = Field(None, examples=["LATE", "Breakfast", "Lunch", "Dinner", "Brunch", "Alcoholic Beverages",
+    # menu_id: int | None = None
+    # menu_course_type_code: str | None = None
+    menu_course_type_desc: str | None = Field(None, examples=["Meal", "Snacks", "Beverages"])
+    # menu_service_type_code: str | None = None
+    menu_service_type_desc: str | None = Field(None, examples=["LATE", "Breakfast", "Lunch", "Dinner", "Brunch", "Alcoholic Beverages",
                                                                   "Non Alcoholic Beverages", "Pre-Arrival", "Complimentary Snacks",
                                                                   "Complimentary Premium Snacks", "Complimentary Premium Snack Basket",
                                                                   "Mid-Flight Snacks", "All day snacks", "Light Snacks", "Late Night",
@@ -64,107 +97,131 @@ class Menu(BaseModel):
                                                                   "First Service Late Night Support", "Premium Snacks", "First Service AM",
                                                                   "First Service PM", "Pre Arrival PM", "First Service Late Night",
                                                                   "Pre Arrival Lighter/Later", "Mid Flight"])
-    # menu_type_code: Optional[str] = None
-    menu_type_desc: Optional[str] = Field(None, examples=["Western Menu", "Japanese Menu", "Chinese Menu", "Korean Menu", "Skip Meal",])
-    menu_type_disp_ord_seq_num: Optional[int] = None
-    # menu_title_text: Optional[str] = None
-    # menu_sub_title_text: Optional[str] = None
-    menu_disp_ord_seq_num: Optional[int] = None
-    menu_notes_text: Optional[str] = None
-    menu_manager_name: Optional[str] = None
-    # menu_image_url_addr: Optional[str] = None
-    # menu_effective_date: Optional[str] = None
-    # menu_expiry_date: Optional[str] = None
-    pre_select: Optional[str] = None
-    # paxia_menu_spec_code: List[str] = Field(default_factory=list)
-    menu_service_preferences: List[MenuServicePreferences] = Field(default_factory=list)
-    menu_items: List[MenuItem] = Field(default_factory=list)
-
-
-class MenuServiceLanguage(BaseModel):
-    """Language details for a menu service"""
-    model_config = ConfigDict(alias_generator=to_camel)
-    menu_service_lang_code: str = Field(..., examples=["EN", "ES", "FR"])
-    menu_service_lang_desc: str
-    menu_service_lang_selected: bool
-
-
-class MenuService(BaseModel):
+    # menu_type_code: str | None = None
+    menu_type_desc: str | None = Field(None, examples=["Western Menu", "Japanese Menu", "Chinese Menu", "Korean Menu", "Skip Meal",])
+    menu_type_disp_ord_seq_num: int | None = None
+    # menu_title_text: str | None = None
+    # menu_sub_title_text: str | None = None
+    menu_disp_ord_seq_num: int | None = None
+    menu_notes_text: str | None = None
+    menu_manager_name: str | None = None
+    # menu_image_url_addr: str | None = None
+    # menu_effective_date: str | None = None
+    # menu_expiry_date: str | None = None
+    pre_select: str | None = None
+    # paxia_menu_spec_code: list[str] = Field(default_factory=list)
+    menu_service_preferences: list[MenuServicePreferences] = Field(default_factory=list)
+    menu_items: list[MenuItem] = Field(default_factory=list)
+
+
+class MenuService(InternedStringsBase):
     """Service-level data for a specific cabin class, containing multiple menus"""
     model_config = ConfigDict(alias_generator=to_camel)
-    # menu_service_id: Optional[int] = None
-    menu_service_desc: Optional[str] = None
-    cabin_type_code: Optional[str] = Field(None, description="C=Delta One/Business, F=Delta Premium Select/First, W=IMC/Comfort, Y=IMC/Coach")
-    cabin_type_desc: Optional[str] = Field(None, examples=["Delta One", "Delta Premium Select", "Main Cabin"])
-    menu_planner_name: Optional[str] = None
-    cabin_preselect_window_start_utc_ts: Optional[str] = None
-    cabin_preselect_window_end_utc_ts: Optional[str] = None
-    digital_menu_avl: Optional[bool] = Field(None, description="Whether digital menu is available")
-    menu_service_meal_time_window: Optional[str] = Field(None, description="When meal service occurs during flight")
-    # cabin_welcome_header: Optional[str] = None
-    # cabin_welcome_title: Optional[str] = None
-    # cabin_welcome_message: Optional[str] = None
-    primary_menu_service_type_desc: Optional[str] = None
-    menu_service_languages: Optional[List[MenuServiceLanguage]] = None
-    menus: List[Menu] = Field(default_factory=list)
-
-
-class FlightMenuResponse(BaseModel):
+    # menu_service_id: int | None = None
+    menu_service_desc: str | None = None
+    cabin_type_code: str | None = Field(None, description="C=Delta One/Business, F=Delta Premium Select/First, W=IMC/Comfort, Y=IMC/Coach")
+    cabin_type_desc: str | None = Field(None, examples=["Delta One", "Delta Premium Select", "Main Cabin"])
+    menu_planner_name: str | None = None
+    cabin_preselect_window_start_utc_ts: str | None = None
+    cabin_preselect_window_end_utc_ts: str | None = None
+    digital_menu_avl: bool | None = Field(None, description="Whether digital menu is available")
+    menu_service_meal_time_window: str | None = Field(None, description="When meal service occurs during flight")
+    # cabin_welcome_header: str | None = None
+    # cabin_welcome_title: str | None = None
+    # cabin_welcome_message: str | None = None
+    primary_menu_service_type_desc: str | None = None
+    lang_codes: tuple[str, ...] = Field((), examples=[("EN", "ES", "FR")])
+    lang_descs: tuple[str, ...] = ()
+    lang_selected: tuple[bool, ...] = ()
+    menus: list[Menu] = Field(default_factory=list)
+
+    @model_validator(mode="before")
+    @classmethod
+    def _split_languages(cls, data: Any) -> Any:
+        """Split the API's menuServiceLanguages list into the parallel lang_* tuples"""
+        if isinstance(data, dict) and "menuServiceLanguages" in data:
+            data = dict(data)
+            languages = data.pop("menuServiceLanguages") or []
+            if not all(isinstance(lang, dict) for lang in languages):
+                raise ValueError("menuServiceLanguages must be a list of objects")
+            # Missing keys become None so the lang_* field validation reports them
+            data["langCodes"] = tuple(lang.get("menuServiceLangCode") for lang in languages)
+            data["langDescs"] = tuple(lang.get("menuServiceLangDesc") for lang in languages)
+            data["langSelected"] = tuple(lang.get("menuServiceLangSelected") for lang in languages)
+        return data
+
+    @cached_property
+    def selected_lang(self) -> str | None:
+        """Code of the language flagged as selected, if any"""
+        if True not in self.lang_selected:
+            return None
+        return self.lang_codes[self.lang_selected.index(True)]
+
+
+class FlightMenuResponse(InternedStringsBase):
     """Complete flight menu response"""
     model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
     operating_carrier_code: str = Field(..., examples=["DL"])
     flight_num: int
     flight_departure_date: str = Field(..., examples=["2025-08-13"])
     flight_departure_airport_code: str = Field(..., examples=["ATL", "LAX", "JFK"])
-    flight_arrival_date: Optional[str] = Field(None, description="Format: YYYY-MM-DD", examples=["2025-08-13"])
-    flight_arrival_airport_code: Optional[str] = Field(None, description="IATA standard Airport codes" ,examples=["ATL", "LAX", "JFK"])
-    segment_id: Optional[str] = None
-    flight_offer_expiration_utc_ts: Optional[str] = None
-    menu_services: List[MenuService] = Field(default_factory=list, description="Menu services by cabin class")
+    flight_arrival_date: str | None = Field(None, description="Format: YYYY-MM-DD", examples=["2025-08-13"])
+    flight_arrival_airport_code: str | None = Field(None, description="IATA standard Airport codes" ,examples=["ATL", "LAX", "JFK"])
+    segment_id: str | None = None
+    flight_offer_expiration_utc_ts: str | None = None
+    menu_services: list[MenuService] = Field(default_factory=list, description="Menu services by cabin class")
     success: bool = True
-    error_message: Optional[str] = None
-    api_response_time_ms: Optional[int] = None
+    error_message: str | None = None
+    api_response_time_ms: int | None = None
+
+
+class FlightMenusPayload(BaseModel):
+    """Top-level menuByFlight body, validated straight from the response bytes"""
+    flight_menus: list[FlightMenuResponse] | None = Field(None, alias="flightMenus")
+    error: str | None = None
 
 
 class FlightMenuError(BaseModel):
     """Error response structure"""
+    model_config = ConfigDict(defer_build=True)
     success: bool = False
     error_message: str
-    error_code: Optional[str] = None
-    request_params: Optional[Dict] = None
+    error_code: str | None = None
+    request_params: dict | None = None
 
-class FlightLeg(BaseModel):
+class FlightLeg(InternedStringsBase):
     """Details of a flight leg for menu availability"""
-    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True, defer_build=True)
     operating_carrier_code: str
     flight_num: int
     flight_departure_airport_code: str = Field(..., examples=["ATL", "LAX", "JFK"])
     departure_local_date: str = Field(..., description="Format: YYYY-MM-DD", examples=["2025-08-13"])
 
-class CabinAvailability(BaseModel):
+class CabinAvailability(InternedStringsBase):
     """Menu availability for a specific cabin class"""
     model_config = ConfigDict(alias_generator=to_camel)
-    cabin_type_code: Optional[str] = Field(None, description="C=Delta One/Business, F=Delta Premium Select/First, W=IMC/Comfort, Y=IMC/Coach")
-    cabin_type_desc: Optional[str] = Field(None, examples=["Delta One", "Delta Premium Select", "IMC"])
-    pre_select_menu_available: Optional[bool] = None
-    digital_menu_available: Optional[bool] = Field(None, description="Whether digital menu is available via API")
-    cabin_preselect_window_start_utc_ts: Optional[str] = None
-    cabin_preselect_window_end_utc_ts: Optional[str] = None
+    cabin_type_code: str | None = Field(None, description="C=Delta One/Business, F=Delta Premium Select/First, W=IMC/Comfort, Y=IMC/Coach")
+    cabin_type_desc: str | None = Field(None, examples=["Delta One", "Delta Premium Select", "IMC"])
+    pre_select_menu_available: bool | None = None
+    digital_menu_available: bool | None = Field(None, description="Whether digital menu is available via API")
+    cabin_preselect_window_start_utc_ts: str | None = None
+    cabin_preselect_window_end_utc_ts: str | None = None
 
 
-class FlightMenuAvailability(BaseModel):
+class FlightMenuAvailability(InternedStringsBase):
     """Menu availability response for a specific flight"""
-    operating_carrier_code: Optional[str] = None
-    flight_num: Optional[int] = None
-    flight_departure_airport_code: Optional[str] = Field(None, examples=["ATL", "LAX", "JFK"])
-    departure_local_date: Optional[str] = Field(None, description="Format: YYYY-MM-DD", examples=["2025-08-13"])
-    status: Optional[str] = None
-    cabins: Optional[List[CabinAvailability]] = None
+    operating_carrier_code: str | None = None
+    flight_num: int | None = None
+    flight_departure_airport_code: str | None = Field(None, examples=["ATL", "LAX", "JFK"])
+    departure_local_date: str | None = Field(None, description="Format: YYYY-MM-DD", examples=["2025-08-13"])
+    status: str | None = None
+    cabins: list[CabinAvailability] | None = None
 
 
 class MenuAvailabilityResponse(BaseModel):
     """Complete menu availability response"""
-    flight_legs: List[FlightMenuAvailability] = Field(default_factory=list)
+    flight_legs: list[FlightMenuAvailability] = Field(default_factory=list)
     success: bool = True
-    error_message: Optional[str] = None
-    api_response_time_ms: Optional[int] = None
\ No newline at end of file
+    error_message: str | None = None
+    api_response_time_ms: int | None = None
+
@@ -1,11 +1,12 @@
+# cython: language_level=3
 from datetime import date
-from typing import List
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class FlightLookupRequest(BaseModel):
     """Request parameters for flight lookup"""
+    model_config = ConfigDict(frozen=True)
     departure_date: date = Field(description="Flight departure date (YYYY-MM-DD)")
     departure_airport: str = Field(description="Departure airport code")
     arrival_airport: str = Field(description="Arrival airport code")
@@ -13,21 +14,27 @@ class FlightLookupRequest(BaseModel):
 
 
 class MenuQueryRequest(BaseModel):
-    """Request parameters for Delta menu API"""
+    """Request parameters for Delta menu API (frozen so it can key the menu cache)"""
+    model_config = ConfigDict(frozen=True)
     departure_date: date = Field(description="Flight departure date (YYYY-MM-DD)")
     flight_number: int = Field(gt=0, description="Flight number")
     departure_airport: str = Field(description="Departure airport code")
     operating_carrier: str = Field(default="DL", description="Airline carrier code")
     lang_cd: str = Field(default="en-US", description="Language code")
 
-    class Config:
-        json_encoders = {
-            date: lambda v: v.isoformat()
-        }
+
+class FlightMenuQuery(BaseModel):
+    """One flight in a batch menu request, as passed by the agent"""
+    model_config = ConfigDict(frozen=True)
+    departure_date: str = Field(description="Flight departure date (YYYY-MM-DD)")
+    flight_number: int = Field(description="Flight number without carrier prefix")
+    departure_airport: str = Field(description="Departure airport code")
+    operating_carrier: str = Field(default="DL", description="Airline carrier code")
 
 
 class ValidationParameters(BaseModel):
     """Parameters used in validation"""
+    model_config = ConfigDict(frozen=True)
     flight_departure_date: str
     flight_number: int
     flight_departure_airport: str
@@ -36,22 +43,25 @@ class ValidationParameters(BaseModel):
 
 class ValidationNextSteps(BaseModel):
     """Next steps based on validation result"""
+    model_config = ConfigDict(frozen=True)
     valid: str = "Ready to make API call"
     invalid: str = "Please fix the issues above before proceeding"
 
 
 class FlightRequestValidation(BaseModel):
     """Validation response for flight request parameters"""
+    model_config = ConfigDict(frozen=True)
     tool: str = "request_validation"
     is_valid: bool
-    issues: List[str]
-    recommendations: List[str]
+    issues: list[str]
+    recommendations: list[str]
     parameters: ValidationParameters
     next_steps: ValidationNextSteps
 
 
 class DebugRequest(BaseModel):
     """Request for debugging API calls"""
+    model_config = ConfigDict(frozen=True)
     endpoint: str = Field(default="menuByFlight")
     params: dict = Field(default_factory=dict)
     include_raw_response: bool = Field(default=False)
\ No newline at end of file
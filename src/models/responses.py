@@ -1,58 +1,90 @@
-from typing import List, Dict, Any, Optional
-from pydantic import BaseModel
+# cython: language_level=3
+from typing import Any, Literal
+from pydantic import BaseModel, ConfigDict
 from datetime import date
 
-from src.models.menu import MenuService
+from src.models.menu import MenuAvailabilityResponse, MenuService
+from src.models.requests import FlightRequestValidation
 
 
 class FlightOption(BaseModel):
+    model_config = ConfigDict(frozen=True)
     flight_number: int
-    departure_time: Optional[str] = None
-    arrival_time: Optional[str] = None
+    departure_time: str | None = None
+    arrival_time: str | None = None
 
 
 class FlightLookupResponse(BaseModel):
+    model_config = ConfigDict(frozen=True)
     departure_airport: str
     arrival_airport: str
     departure_date: str
     operating_carrier: str
-    flights: List[FlightOption]
+    flights: list[FlightOption]
     success: bool
-    error_message: Optional[str] = None
+    error_message: str | None = None
 
 
 # Using a simplified MenuItem for tool output
 class SimpleMenuItem(BaseModel):
+    model_config = ConfigDict(frozen=True)
     name: str
-    description: Optional[str] = None
-    dietary_info: Optional[List[str]] = None
+    description: str | None = None
+    dietary_info: list[str] | None = None
 
 class FlightInfo(BaseModel):
+    model_config = ConfigDict(frozen=True)
     carrier: str
     flight_number: int
     date: date
     departure_airport: str
-    arrival_airport: Optional[str] = None
+    arrival_airport: str | None = None
 
 class ToolResponse(BaseModel):
+    model_config = ConfigDict(frozen=True)
     query_type: str
     success: bool
-    error_message: Optional[str] = None
+    error_message: str | None = None
+
+class RouteInfo(BaseModel):
+    model_config = ConfigDict(frozen=True)
+    departure_airport: str
+    arrival_airport: str
+    departure_date: str
+    operating_carrier: str
+
+class FlightRouteLookupResponse(ToolResponse):
+    query_type: Literal["flight_lookup"] = "flight_lookup"
+    route_info: RouteInfo | None = None
+    flights: list[FlightOption] | None = None
+
+class FlightSelectionResponse(ToolResponse):
+    query_type: Literal["flight_selection"] = "flight_selection"
+    message: str
+    flights: list[FlightOption]
+    route_info: RouteInfo
 
 class CompleteMenuResponse(ToolResponse):
-    flight_info: Optional[FlightInfo] = None
-    menu_services: Optional[List[MenuService]] = None
-    availability_check: Optional[Dict[str, Any]] = None
-    metadata: Optional[Dict[str, Any]] = None
+    query_type: Literal["complete_menu"] = "complete_menu"
+    flight_info: FlightInfo | None = None
+    menu_services: list[MenuService] | None = None
+    availability_check: MenuAvailabilityResponse | None = None
+    metadata: dict[str, Any] | None = None
+
+class BatchMenuResponse(BaseModel):
+    model_config = ConfigDict(frozen=True)
+    results: list[CompleteMenuResponse | FlightRequestValidation]
 
 class CabinDetail(BaseModel):
+    model_config = ConfigDict(frozen=True)
     code: str
     name: str
-    service_time: Optional[str] = None
-    special_notes: Optional[str] = None
+    service_time: str | None = None
+    special_notes: str | None = None
 
 class CabinComparisonDetail(BaseModel):
+    model_config = ConfigDict(frozen=True)
     name: str
-    menu_summary: Dict[str, Any]
-    highlights: List[Dict[str, str]]
+    menu_summary: dict[str, Any]
+    highlights: list[dict[str, str]]
 
@@ -1,11 +1,124 @@
 from typing import Dict, Any
+import re
 import time
 from datetime import date
+from urllib.parse import urlencode
 
 from agents import function_tool
+from pydantic_core import to_json
 from ..client.delta_client import DeltaMenuClient
 from ..models.requests import MenuQueryRequest
 
+# Common error patterns and solutions, in match priority order (most frequent first)
+_ERROR_PATTERNS = {
+    "timeout": {
+        "diagnosis": "Request timed out",
+        "solutions": [
+            "Check internet connection",
+            "Try again in a few minutes",
+            "API may be temporarily slow"
+        ]
+    },
+    "404": {
+        "diagnosis": "Flight or route not found",
+        "solutions": [
+            "Verify flight number and carrier code",
+            "Check if flight operates on the specified date",
+            "Confirm departure airport code is correct",
+            "Try a different date if flight doesn't operate daily"
+        ]
+    },
+    "400": {
+        "diagnosis": "Invalid request parameters",
+        "solutions": [
+            "Check date format (use YYYY-MM-DD)",
+            "Verify airport codes are 3 letters",
+            "Ensure carrier code is 2 letters",
+            "Use validate_flight_request tool to check parameters"
+        ]
+    },
+    "invalid date": {
+        "diagnosis": "Date format or value issue",
+        "solutions": [
+            "Use YYYY-MM-DD format",
+            "Ensure date is not in the past",
+            "Check date is within reasonable range (not > 1 year ahead)"
+        ]
+    },
+    "no menu": {
+        "diagnosis": "Menu data unavailable",
+        "solutions": [
+            "Menu may not be available yet for this flight",
+            "Try a different date",
+            "Some flights may not have detailed menu information",
+            "Check if it's a codeshare flight"
+        ]
+    }
+}
+_DEFAULT_DIAGNOSIS = {
+    "diagnosis": "Unknown error",
+    "solutions": [
+        "Check all request parameters",
+        "Verify internet connection",
+        "Try again in a few minutes",
+        "Contact support if issue persists"
+    ]
+}
+_DIAGNOSIS_NEXT_STEPS = (
+    "Use validate_flight_request to check parameters",
+    "Use validate_api_health to check API status",
+    "Use trace_api_call to verify request format",
+    "Try the request with different parameters"
+)
+_ERROR_DIAGNOSES = tuple(_ERROR_PATTERNS.values())
+_ERROR_PATTERN_RE = re.compile("|".join(f"({re.escape(pattern)})" for pattern in _ERROR_PATTERNS))
+
+# Static parts of the trace_api_call payload, shared across calls (kept as plain
+# dicts/tuples so the tool result stays JSON serializable)
+_TRACE_BASE_URL = "https://ifsobs-api.delta.com/CatFltMenuSvcRst/v1/menuByFlight"
+_TRACE_HEADERS = {
+    "accept": "application/json, text/plain, */*",
+    "accept-language": "en-US,en;q=0.8",
+    "channelid": "DGMNPT",
+    "origin": "https://menu.delta.com",
+    "priority": "u=1, i",
+    "referer": "https://menu.delta.com/",
+    "sec-gpc": "1",
+    "user-agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+    "transactionid": "auto-generated-uuid"
+}
+_CURL_TEMPLATE = """curl '{url}' \\
+  -H 'accept: application/json, text/plain, */*' \\
+  -H 'accept-language: en-US,en;q=0.8' \\
+  -H 'channelid: DGMNPT' \\
+  -H 'origin: https://menu.delta.com' \\
+  -H 'priority: u=1, i' \\
+  -H 'referer: https://menu.delta.com/' \\
+  -H 'sec-gpc: 1' \\
+  -H 'user-agent: Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'"""
+_TRACE_COMMON_ISSUES = (
+    "Invalid date format - use YYYY-MM-DD",
+    "Flight not found - check flight number and carrier",
+    "Airport code invalid - use 3-letter codes",
+    "Date too far in the past or future"
+)
+_TRACE_TROUBLESHOOTING_TIPS = (
+    "Verify all parameters are correct",
+    "Check if flight operates on the specified date",
+    "Try a different date if menu unavailable",
+    "Use validate_flight_request tool to check parameters"
+)
+_TRACE_DEBUG_INFO = {
+    "expected_response_format": "JSON with flight and cabin menu data",
+    "common_issues": _TRACE_COMMON_ISSUES,
+    "troubleshooting_tips": _TRACE_TROUBLESHOOTING_TIPS
+}
+
+
+def _to_json(result: Dict[str, Any]) -> str:
+    """Serialize a tool result to the JSON text the agents SDK hands to the model"""
+    return to_json(result).decode()
+
 
 class DebugTools:
     """Tools for debugging and troubleshooting Delta API issues"""
@@ -14,7 +127,7 @@ class DebugTools:
         self.client = client
     
     @function_tool
-    async def validate_api_health(self) -> Dict[str, Any]:
+    async def validate_api_health(self) -> str:
         """
         Check if the Delta menu API is accessible and healthy.
         
@@ -24,7 +137,7 @@ class DebugTools:
         try:
             health_check = await self.client.check_api_health()
             
-            return {
+            return _to_json({
                 "tool": "api_health_check",
                 "status": health_check.get('status', 'unknown'),
                 "details": {
@@ -37,10 +150,10 @@ class DebugTools:
                     "healthy": "API is responding normally",
                     "unhealthy": "API may be experiencing issues. Check network connectivity or try again later."
                 }
-            }
+            })
             
         except Exception as e:
-            return {
+            return _to_json({
                 "tool": "api_health_check",
                 "status": "error",
                 "error": str(e),
@@ -49,7 +162,7 @@ class DebugTools:
                     "Verify API endpoint URL",
                     "Check if Delta API is temporarily down"
                 ]
-            }
+            })
     
 
     @function_tool
@@ -59,7 +172,7 @@ class DebugTools:
         flight_number: int,
         departure_airport: str,
         operating_carrier: str = "DL"
-    ) -> Dict[str, Any]:
+    ) -> str:
         """
         Trace and log full API request/response details for debugging.
         
@@ -82,75 +195,43 @@ class DebugTools:
             }
             
             # Calculate expected URL
-            base_url = "https://ifsobs-api.delta.com/CatFltMenuSvcRst/v1/menuByFlight"
-            query_string = "&".join([f"{k}={v}" for k, v in params.items()])
+            base_url = _TRACE_BASE_URL
+            query_string = urlencode(params)
             full_url = f"{base_url}?{query_string}"
             
             # Get actual response (without making the call)
             # For now, return the trace information
-            return {
+            return _to_json({
                 "tool": "api_trace",
                 "request_details": {
                     "method": "GET",
                     "url": full_url,
                     "base_url": base_url,
                     "parameters": params,
-                    "headers": {
-                        "accept": "application/json, text/plain, */*",
-                        "accept-language": "en-US,en;q=0.8",
-                        "channelid": "DGMNPT",
-                        "origin": "https://menu.delta.com",
-                        "priority": "u=1, i",
-                        "referer": "https://menu.delta.com/",
-                        "sec-gpc": "1",
-                        "user-agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
-                        "transactionid": "auto-generated-uuid"
-                    }
-                },
-                "debug_info": {
-                    "expected_response_format": "JSON with flight and cabin menu data",
-                    "common_issues": [
-                        "Invalid date format - use YYYY-MM-DD",
-                        "Flight not found - check flight number and carrier",
-                        "Airport code invalid - use 3-letter codes",
-                        "Date too far in the past or future"
-                    ],
-                    "troubleshooting_tips": [
-                        "Verify all parameters are correct",
-                        "Check if flight operates on the specified date",
-                        "Try a different date if menu unavailable",
-                        "Use validate_flight_request tool to check parameters"
-                    ]
+                    "headers": _TRACE_HEADERS
                 },
+                "debug_info": _TRACE_DEBUG_INFO,
                 "manual_testing": {
-                    "curl_command": f"""curl '{full_url}' \\
-  -H 'accept: application/json, text/plain, */*' \\
-  -H 'accept-language: en-US,en;q=0.8' \\
-  -H 'channelid: DGMNPT' \\
-  -H 'origin: https://menu.delta.com' \\
-  -H 'priority: u=1, i' \\
-  -H 'referer: https://menu.delta.com/' \\
-  -H 'sec-gpc: 1' \\
-  -H 'user-agent: Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'""",
+                    "curl_command": _CURL_TEMPLATE.format(url=full_url),
                     "browser_url": full_url
                 }
-            }
+            })
             
         except ValueError as e:
-            return {
+            return _to_json({
                 "tool": "api_trace",
                 "error": f"Invalid date format: {e}",
                 "recommendation": "Use YYYY-MM-DD format"
-            }
+            })
         except Exception as e:
-            return {
+            return _to_json({
                 "tool": "api_trace",
                 "error": str(e),
                 "recommendation": "Check all parameters are valid"
-            }
+            })
     
     @function_tool
-    async def diagnose_error(self, error_message: str) -> Dict[str, Any]:
+    async def diagnose_error(self, error_message: str) -> str:
         """
         Diagnose common API error messages and provide solutions.
         
@@ -160,80 +241,19 @@ class DebugTools:
         Returns:
             Diagnosis and recommended solutions
         """
-        error_lower = error_message.lower()
-        
-        # Common error patterns and solutions
-        error_patterns = {
-            "timeout": {
-                "diagnosis": "Request timed out",
-                "solutions": [
-                    "Check internet connection",
-                    "Try again in a few minutes",
-                    "API may be temporarily slow"
-                ]
-            },
-            "404": {
-                "diagnosis": "Flight or route not found",
-                "solutions": [
-                    "Verify flight number and carrier code",
-                    "Check if flight operates on the specified date",
-                    "Confirm departure airport code is correct",
-                    "Try a different date if flight doesn't operate daily"
-                ]
-            },
-            "400": {
-                "diagnosis": "Invalid request parameters",
-                "solutions": [
-                    "Check date format (use YYYY-MM-DD)",
-                    "Verify airport codes are 3 letters",
-                    "Ensure carrier code is 2 letters",
-                    "Use validate_flight_request tool to check parameters"
-                ]
-            },
-            "invalid date": {
-                "diagnosis": "Date format or value issue",
-                "solutions": [
-                    "Use YYYY-MM-DD format",
-                    "Ensure date is not in the past",
-                    "Check date is within reasonable range (not > 1 year ahead)"
-                ]
-            },
-            "no menu": {
-                "diagnosis": "Menu data unavailable",
-                "solutions": [
-                    "Menu may not be available yet for this flight",
-                    "Try a different date",
-                    "Some flights may not have detailed menu information",
-                    "Check if it's a codeshare flight"
-                ]
-            }
-        }
-        
-        # Find matching pattern
-        diagnosis = {
-            "diagnosis": "Unknown error",
-            "solutions": [
-                "Check all request parameters",
-                "Verify internet connection",
-                "Try again in a few minutes",
-                "Contact support if issue persists"
-            ]
-        }
-        
-        for pattern, info in error_patterns.items():
-            if pattern in error_lower:
-                diagnosis = info
-                break
+        # Find matching pattern; empty messages skip straight to the default
+        diagnosis = _DEFAULT_DIAGNOSIS
+        if error_message:
+            # Single regex scan; the lowest group number is the highest-priority pattern
+            error_lower = error_message.lower()
+            matched = min((m.lastindex for m in _ERROR_PATTERN_RE.finditer(error_lower)), default=None)
+            if matched:
+                diagnosis = _ERROR_DIAGNOSES[matched - 1]
         
-        return {
+        return _to_json({
             "tool": "error_diagnosis",
             "error_message": error_message,
             "diagnosis": diagnosis["diagnosis"],
             "solutions": diagnosis["solutions"],
-            "next_steps": [
-                "Use validate_flight_request to check parameters",
-                "Use validate_api_health to check API status",
-                "Use trace_api_call to verify request format",
-                "Try the request with different parameters"
-            ]
-        }
\ No newline at end of file
+            "next_steps": _DIAGNOSIS_NEXT_STEPS
+        })
\ No newline at end of file
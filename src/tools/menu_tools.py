@@ -1,29 +1,253 @@
-from datetime import date
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from datetime import date, timedelta
+from functools import cached_property, lru_cache
 from typing import Dict, Any
 
 from agents import function_tool
+from pydantic import BaseModel
+from pydantic_core import to_json
 
 from ..client.delta_client import DeltaMenuClient
-from ..models.menu import FlightLeg
-from ..models.requests import MenuQueryRequest, FlightLookupRequest
+from ..models.menu import (
+    CabinAvailability,
+    FlightLeg,
+    FlightMenuAvailability,
+    FlightMenuError,
+    FlightMenuResponse,
+    MenuAvailabilityResponse,
+)
+from ..models.requests import MenuQueryRequest, FlightLookupRequest, FlightMenuQuery, FlightRequestValidation
 from ..models.responses import (
+    BatchMenuResponse,
     CompleteMenuResponse,
     FlightInfo,
+    FlightRouteLookupResponse,
+    FlightSelectionResponse,
+    RouteInfo,
 )
-from ..utils.logging_config import setup_logging, get_logger
+from ..utils.logging_config import get_logger
 
-# Setup logging
-setup_logging(log_file='gradio_app.log')
 logger = get_logger(__name__)
 
+
+@lru_cache(maxsize=512)
+def _parse_date(departure_date: str) -> date:
+    """Parse a YYYY-MM-DD tool argument; agents repeat the same dates across calls"""
+    return date.fromisoformat(departure_date)
+
+
+def _parse_cabin_codes(cabin_codes: str | None) -> frozenset[str] | None:
+    """Normalize a comma-separated cabin filter once, at the tool boundary"""
+    if not cabin_codes:
+        return None
+    return frozenset(code.strip().upper() for code in cabin_codes.split(','))
+
+
+def _invalid_date_message(departure_date: str) -> str:
+    """Error text returned to the agent for a departure date that is not YYYY-MM-DD"""
+    return f"Invalid date format: {departure_date!r}. Use YYYY-MM-DD"
+
+
+@lru_cache(maxsize=256)
+def _build_menu_request(departure_date: str, flight_number: int, departure_airport: str,
+                        operating_carrier: str) -> MenuQueryRequest:
+    """Build the frozen menu request for a raw tool argument tuple.
+
+    validate_flight_request performs the range checks, so construction skips Pydantic validation.
+    """
+    return MenuQueryRequest.model_construct(
+        departure_date=_parse_date(departure_date),
+        flight_number=flight_number,
+        departure_airport=departure_airport,
+        operating_carrier=operating_carrier
+    )
+
+
+def _log_tool_failure(tool_name: str, error: Exception) -> None:
+    """Log a failed tool call; the traceback is only formatted when DEBUG is enabled"""
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.exception("TOOL: %s failed - %s", tool_name, error, stacklevel=2)
+    else:
+        logger.error("TOOL: %s failed - %s", tool_name, error, stacklevel=2)
+
+
+def _availability_from_menu(response: FlightMenuResponse | FlightMenuError) -> MenuAvailabilityResponse:
+    """Derive per-cabin digital menu availability from a menu response.
+
+    Preselect windows only come from the availability API, which check_menu_availability still calls.
+    """
+    if not response.success:
+        return MenuAvailabilityResponse.model_construct(success=False, error_message=response.error_message)
+    return MenuAvailabilityResponse.model_construct(
+        flight_legs=[FlightMenuAvailability.model_construct(
+            operating_carrier_code=response.operating_carrier_code,
+            flight_num=response.flight_num,
+            flight_departure_airport_code=response.flight_departure_airport_code,
+            departure_local_date=response.flight_departure_date,
+            cabins=[
+                CabinAvailability.model_construct(
+                    cabin_type_code=service.cabin_type_code,
+                    cabin_type_desc=service.cabin_type_desc,
+                    # Trust the API's own flag; only infer from the menus when it is missing
+                    digital_menu_available=(service.digital_menu_avl if service.digital_menu_avl is not None
+                                            else bool(service.menus))
+                )
+                for service in response.menu_services
+            ]
+        )],
+        success=True,
+        api_response_time_ms=response.api_response_time_ms
+    )
+
+
+def _to_json(result: BaseModel | Dict[str, Any]) -> str:
+    """Serialize a tool result straight to the JSON text the agents SDK hands to the model.
+
+    The SDK stringifies whatever a tool returns, so returning JSON skips building an
+    intermediate dict and gives the model JSON instead of a Python repr. Fields keep their
+    snake_case names (no by_alias), the same keys model_dump() produced before.
+    """
+    if isinstance(result, BaseModel):
+        return result.__pydantic_serializer__.to_json(result, exclude_none=True, warnings=False).decode()
+    return to_json(result, exclude_none=True).decode()
+
+
 class MenuTools:
     """Tools for querying Delta flight menus"""
+
+    # Agents often follow up on the same flight a day earlier or later
+    PREFETCH_DAY_OFFSETS = (-1, 1)
+    PREFETCH_HISTORY_SIZE = 1024
+    # Upper bound on concurrent upstream menu requests from one batch call
+    BATCH_CONCURRENCY = 10
     
     def __init__(self, client: DeltaMenuClient):
         self.client = client
+        # Prefetched requests and when their warmed menu leaves the client cache
+        self._prefetched: OrderedDict[MenuQueryRequest, float] = OrderedDict()
+        self._prefetch_tasks: set[asyncio.Task] = set()
+
+    def _prefetch_adjacent_dates(self, dep_date: date, flight_number: int, departure_airport: str,
+                                 operating_carrier: str) -> None:
+        """Warm the client's menu cache for the same flight on neighbouring days without blocking"""
+        today = date.today()
+        now = time.monotonic()
+        for offset in self.PREFETCH_DAY_OFFSETS:
+            day = dep_date + timedelta(days=offset)
+            if day < today:
+                continue
+            request = _build_menu_request(day.isoformat(), flight_number, departure_airport, operating_carrier)
+            if self._prefetched.get(request, 0.0) > now:
+                continue
+            # Re-warm once the prefetched menu has expired from the client cache
+            self._prefetched[request] = now + DeltaMenuClient.MENU_CACHE_TTL
+            self._prefetched.move_to_end(request)
+            if len(self._prefetched) > self.PREFETCH_HISTORY_SIZE:
+                self._prefetched.popitem(last=False)
+
+            logger.debug("Prefetching menu for %s%s on %s", operating_carrier, flight_number, day)
+            task = asyncio.create_task(self.client.get_menu_by_flight(request))
+            self._prefetch_tasks.add(task)
+            task.add_done_callback(self._prefetch_tasks.discard)
+
+    async def close(self) -> None:
+        """Cancel outstanding prefetches; call before the client and its HTTP pool are closed"""
+        tasks = list(self._prefetch_tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
     
+    async def _menu_for_flight(self, departure_date: str, flight_number: int, departure_airport: str,
+                               operating_carrier: str, requested_cabins: frozenset[str] | None = None,
+                               check_availability: bool = False,
+                               prefetch_adjacent: bool = True) -> CompleteMenuResponse | FlightRequestValidation:
+        """Validate, fetch and format the menu for one specific flight"""
+        dep_date = _parse_date(departure_date)
+        request = _build_menu_request(departure_date, flight_number, departure_airport, operating_carrier)
+        logger.debug("MenuQueryRequest created")
+
+        flight_request_validation = self.client.validate_flight_request(request)
+        logger.debug("Request validation result: %s", flight_request_validation.is_valid)
+        if not flight_request_validation.is_valid:
+            logger.warning("Request validation failed: %s", flight_request_validation.issues)
+            return flight_request_validation
+
+        # Get menu data
+        logger.debug("Calling client.get_menu_by_flight")
+        response = await self.client.get_menu_by_flight(request)
+        logger.debug("Client response success: %s", response.success)
+        if isinstance(response, FlightMenuError):
+            # 4xx, transport and parse failures carry no flight or menu fields
+            logger.warning("TOOL: get_menu_by_flight - client error for %s%s: %s",
+                           operating_carrier, flight_number, response.error_message)
+            return CompleteMenuResponse.model_construct(
+                success=False,
+                error_message=response.error_message,
+                availability_check=_availability_from_menu(response) if check_availability else None
+            )
+
+        # The menu response already shows which cabins have menus, so no separate availability call is made
+        availability = None
+        if check_availability:
+            availability = _availability_from_menu(response)
+            has_digital_menu = availability.success and any(
+                cabin.digital_menu_available
+                for leg in availability.flight_legs
+                for cabin in leg.cabins or ()
+            )
+            if not has_digital_menu:
+                logger.info("TOOL: get_menu_by_flight - no digital menus available for %s%s",
+                            operating_carrier, flight_number)
+                return CompleteMenuResponse.model_construct(
+                    success=False,
+                    error_message=availability.error_message or "No digital menus available for this flight",
+                    availability_check=availability
+                )
+        
+        # Filter menu services by cabin codes if specified
+        filtered_menu_services = response.menu_services
+        if requested_cabins and response.menu_services:
+            filtered_menu_services = [
+                service for service in response.menu_services
+                if service.cabin_type_code in requested_cabins
+            ]
+            logger.debug("Filtered menu services from %d to %d for cabins: %s",
+                         len(response.menu_services), len(filtered_menu_services), requested_cabins)
+        service_count = len(filtered_menu_services) if filtered_menu_services else 0
+
+        # Format response for readability; the client response was validated at ingest
+        flight_info = FlightInfo.model_construct(
+            carrier=response.operating_carrier_code,
+            flight_number=response.flight_num,
+            date=dep_date,
+            departure_airport=response.flight_departure_airport_code,
+            arrival_airport=getattr(response, 'flight_arrival_airport_code', None)
+        )
+        logger.debug("Flight info formatted")
+
+        result = CompleteMenuResponse.model_construct(
+            flight_info=flight_info,
+            success=response.success,
+            error_message=response.error_message,
+            menu_services=filtered_menu_services,
+            availability_check=availability,
+            metadata={"api_response_time_ms": response.api_response_time_ms}
+        )
+        
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("TOOL: get_menu_by_flight completed successfully - %d menu services returned",
+                        service_count)
+        logger.debug("Returning get menu by flight result with %d services", service_count)
+        if prefetch_adjacent and response.success:
+            self._prefetch_adjacent_dates(dep_date, flight_number, departure_airport, operating_carrier)
+        return result
+
+    @cached_property
     def get_menu_by_flight_tool(self):
-        """Create the menu function tool"""
+        """The menu function tool, built once per MenuTools instance"""
 
         @function_tool
         async def get_flight_menu(
@@ -32,8 +256,9 @@ class MenuTools:
                 flight_number: int = None,
                 arrival_airport: str = None,
                 operating_carrier: str = "DL",
-                cabin_codes: str = None
-        ) -> Dict[str, Any]:
+                cabin_codes: str = None,
+                check_availability: bool = False
+        ) -> str:
             """
            Get complete flight menu information for Delta flights. If flight_number is not provided,
            will lookup available flights for the route and ask user to select. Returns detailed menu items,
@@ -48,26 +273,40 @@ class MenuTools:
                 arrival_airport: Optional arrival airport code (required if flight_number not provided)
                 operating_carrier: Airline carrier code (default: DL)
                 cabin_codes: Optional comma-separated cabin codes to filter results (C=Delta One/Business, F=Delta Premium Select/First, W=Comfort+, Y=Main Cabin/Economy)
+                check_availability: Also report which cabins have digital menus; returns an error if none do (use check_menu_availability for preselect windows)
 
             Returns:
                 Flight menu information or flight options for selection
             """
-            logger.info(f"TOOL: get_menu_by_flight called - {operating_carrier}{flight_number or 'TBD'} on {departure_date} from {departure_airport} to {arrival_airport or 'TBD'}")
+            logger.info("TOOL: get_menu_by_flight called - %s%s on %s from %s to %s",
+                        operating_carrier, flight_number or 'TBD', departure_date, departure_airport, arrival_airport or 'TBD')
+            # Normalize codes once so request and cache keys don't depend on the agent's casing
+            departure_airport = departure_airport.upper()
+            arrival_airport = arrival_airport.upper() if arrival_airport else arrival_airport
+            operating_carrier = operating_carrier.upper()
             
+            # Reject malformed dates before any upstream call
+            try:
+                dep_date = _parse_date(departure_date)
+            except ValueError:
+                logger.warning("TOOL: get_menu_by_flight rejected date %r", departure_date)
+                return _to_json(CompleteMenuResponse.model_construct(
+                    success=False,
+                    error_message=_invalid_date_message(departure_date)
+                ))
+            logger.debug("Parsed departure date: %s", dep_date)
+
             try:
-                dep_date = date.fromisoformat(departure_date)
-                logger.debug(f"Parsed departure date: {dep_date}")
-                
                 # If no flight number provided, lookup flights by route
                 if flight_number is None:
                     if not arrival_airport:
-                        return {
-                            "query_type": "flight_lookup",
-                            "success": False,
-                            "error_message": "arrival_airport is required when flight_number is not provided"
-                        }
+                        return _to_json(FlightRouteLookupResponse.model_construct(
+                            success=False,
+                            error_message="arrival_airport is required when flight_number is not provided"
+                        ))
                     
-                    lookup_request = FlightLookupRequest(
+                    # Arguments are already typed by the tool schema and dep_date is parsed, so skip re-validation
+                    lookup_request = FlightLookupRequest.model_construct(
                         departure_date=dep_date,
                         departure_airport=departure_airport,
                         arrival_airport=arrival_airport,
@@ -77,137 +316,171 @@ class MenuTools:
                     lookup_response = await self.client.lookup_flights(lookup_request)
                     
                     if not lookup_response.success or not lookup_response.flights:
-                        return {
-                            "query_type": "flight_lookup",
-                            "success": False,
-                            "error_message": lookup_response.error_message or "No flights found for this route"
-                        }
+                        return _to_json(FlightRouteLookupResponse.model_construct(
+                            success=False,
+                            error_message=lookup_response.error_message or "No flights found for this route"
+                        ))
                     
                     # Return flight options for user selection
-                    return {
-                        "query_type": "flight_selection",
-                        "success": True,
-                        "message": f"Found {len(lookup_response.flights)} flights from {departure_airport} to {arrival_airport} on {departure_date}. Please select a flight:",
-                        "flights": lookup_response.flights,
-                        "route_info": {
-                            "departure_airport": departure_airport,
-                            "arrival_airport": arrival_airport,
-                            "departure_date": departure_date,
-                            "operating_carrier": operating_carrier
-                        }
-                    }
+                    return _to_json(FlightSelectionResponse.model_construct(
+                        success=True,
+                        message=f"Found {len(lookup_response.flights)} flights from {departure_airport} to {arrival_airport} on {departure_date}. Please select a flight:",
+                        flights=lookup_response.flights,
+                        route_info=RouteInfo.model_construct(
+                            departure_airport=departure_airport,
+                            arrival_airport=arrival_airport,
+                            departure_date=departure_date,
+                            operating_carrier=operating_carrier
+                        )
+                    ))
                 
                 # Proceed with menu query using provided flight number
-                request = MenuQueryRequest(
-                    departure_date=dep_date,
-                    flight_number=flight_number,
-                    departure_airport=departure_airport,
-                    operating_carrier=operating_carrier
-                )
-                logger.debug("MenuQueryRequest created")
-
-                flight_request_validation = self.client.validate_flight_request(request)
-                logger.debug(f"Request validation result: {flight_request_validation.is_valid}")
-                if not flight_request_validation.is_valid:
-                    logger.warning(f"Request validation failed: {flight_request_validation.issues}")
-                    return flight_request_validation.model_dump(exclude_none=True)
-
-                # Get menu data
-                logger.debug("Calling client.get_menu_by_flight")
-                response = await self.client.get_menu_by_flight(request)
-                logger.debug(f"Client response success: {response.success}")
-                
-                # Filter menu services by cabin codes if specified
-                filtered_menu_services = response.menu_services
-                if cabin_codes and response.menu_services:
-                    requested_cabins = [code.strip().upper() for code in cabin_codes.split(',')]
-                    filtered_menu_services = [
-                        service for service in response.menu_services 
-                        if service.cabin_type_code and service.cabin_type_code.upper() in requested_cabins
-                    ]
-                    logger.debug(f"Filtered menu services from {len(response.menu_services)} to {len(filtered_menu_services)} for cabins: {requested_cabins}")
-
-                # Format response for readability
-                flight_info = FlightInfo(
-                    carrier=response.operating_carrier_code,
-                    flight_number=response.flight_num,
-                    date=dep_date,
-                    departure_airport=response.flight_departure_airport_code,
-                    arrival_airport=getattr(response, 'flight_arrival_airport_code', None)
-                )
-                logger.debug("Flight info formatted")
-
-                result = CompleteMenuResponse(
-                    query_type="complete_menu",
-                    flight_info=flight_info,
-                    success=response.success,
-                    error_message=response.error_message,
-                    menu_services=filtered_menu_services,
-                    metadata={"api_response_time_ms": response.api_response_time_ms}
-                ).model_dump(exclude_none=True)
-                
-                logger.info(f"TOOL: get_menu_by_flight completed successfully - {len(filtered_menu_services or [])} menu services returned")
-                logger.info(f"Returning get menu by flight result: {result}")
-                return result
+                return _to_json(await self._menu_for_flight(
+                    departure_date, flight_number, departure_airport, operating_carrier,
+                    requested_cabins=_parse_cabin_codes(cabin_codes), check_availability=check_availability
+                ))
 
             except Exception as e:
-                logger.error(f"TOOL: get_menu_by_flight failed - {str(e)}", exc_info=True)
-                return CompleteMenuResponse(
-                    query_type="complete_menu",
+                _log_tool_failure("get_menu_by_flight", e)
+                return _to_json(CompleteMenuResponse.model_construct(
                     success=False,
                     error_message=str(e)
-                ).model_dump(exclude_none=True)
+                ))
         
         return get_flight_menu
 
+    @cached_property
+    def get_menus_by_flights_tool(self):
+        """The batch menu function tool, built once per MenuTools instance"""
+
+        @function_tool
+        async def get_menus_by_flights(
+                queries: list[FlightMenuQuery],
+                cabin_codes: str = None
+        ) -> str:
+            """
+            Get menus for several specific flights in one call. Use this instead of repeated
+            get_flight_menu calls when comparing menus across flights or dates.
+
+            Args:
+                queries: Flights to look up, each with departure_date (YYYY-MM-DD), flight_number, departure_airport and operating_carrier
+                cabin_codes: Optional comma-separated cabin codes applied to every flight (C=Delta One/Business, F=Delta Premium Select/First, W=Comfort+, Y=Main Cabin/Economy)
+
+            Returns:
+                One menu result per query, in the same order as the queries
+            """
+            logger.info("TOOL: get_menus_by_flights called - %d flights", len(queries))
+            requested_cabins = _parse_cabin_codes(cabin_codes)
+            semaphore = asyncio.Semaphore(self.BATCH_CONCURRENCY)
+
+            async def fetch(query: FlightMenuQuery) -> CompleteMenuResponse | FlightRequestValidation:
+                # Same early date check and error text as get_flight_menu
+                try:
+                    _parse_date(query.departure_date)
+                except ValueError:
+                    logger.warning("TOOL: get_menus_by_flights rejected date %r", query.departure_date)
+                    return CompleteMenuResponse.model_construct(
+                        success=False,
+                        error_message=_invalid_date_message(query.departure_date)
+                    )
+                async with semaphore:
+                    try:
+                        return await self._menu_for_flight(
+                            query.departure_date, query.flight_number, query.departure_airport.upper(),
+                            query.operating_carrier.upper(), requested_cabins=requested_cabins,
+                            # Prefetch tasks would run outside the semaphore and triple the upstream fan-out
+                            prefetch_adjacent=False
+                        )
+                    except Exception as e:
+                        _log_tool_failure("get_menus_by_flights", e)
+                        return CompleteMenuResponse.model_construct(success=False, error_message=str(e))
+
+            results = await asyncio.gather(*(fetch(query) for query in queries))
+            logger.info("TOOL: get_menus_by_flights completed - %d of %d succeeded",
+                        sum(1 for result in results if getattr(result, 'success', False)), len(results))
+            return _to_json(BatchMenuResponse.model_construct(results=results))
+
+        return get_menus_by_flights
+
+    @cached_property
     def check_menu_availability_tool(self):
-        """Create the menu availability function tool"""
+        """The menu availability function tool, built once per MenuTools instance"""
 
         @function_tool
         async def check_menu_availability(
                 departure_date: str,
-                flight_number: int,
                 departure_airport: str,
+                flight_number: int = None,
                 operating_carrier: str = "DL",
-        ) -> Dict[str, Any]:
+                flight_numbers: str = None,
+        ) -> str:
             """
-            Check menu availability for a specific flight. Also use to verify if menus exist.
+            Check menu availability for one or more flights. Also use to verify if menus exist.
             Can verify preselect eligibility and also time windows for preselect for cabins.
+            Pass flight_numbers to check several flights from the same airport and date in one call.
 
             Args:
                 departure_date: Flight departure date in YYYY-MM-DD format
-                flight_number: Flight number
                 departure_airport: Departure airport code
+                flight_number: Flight number (for a single flight)
                 operating_carrier: Airline carrier code (default: DL)
+                flight_numbers: Optional comma-separated flight numbers (e.g., "30,52,74")
 
             Returns:
-                Availability details for the specified flight
+                Availability details for the specified flights
             """
-            logger.info(f"TOOL: check_menu_availability called - {operating_carrier}{flight_number} on {departure_date} from {departure_airport}")
+            logger.info("TOOL: check_menu_availability called - %s%s on %s from %s",
+                        operating_carrier, flight_numbers or flight_number, departure_date, departure_airport)
+            departure_airport = departure_airport.upper()
+            operating_carrier = operating_carrier.upper()
 
+            # Reject malformed dates before fetching an OAuth token or calling the API
             try:
-                flight_leg = FlightLeg(
-                    operating_carrier_code=operating_carrier,
-                    flight_num=flight_number,
-                    flight_departure_airport_code=departure_airport,
-                    departure_local_date=departure_date,
-                )
-                logger.debug("FlightLeg created for availability check")
+                _parse_date(departure_date)
+            except ValueError:
+                logger.warning("TOOL: check_menu_availability rejected date %r", departure_date)
+                return _to_json({
+                    "success": False,
+                    "error_message": _invalid_date_message(departure_date)
+                })
+
+            try:
+                numbers = [int(num) for num in flight_numbers.split(',')] if flight_numbers else []
+                if flight_number is not None and flight_number not in numbers:
+                    numbers.insert(0, flight_number)
+                if not numbers:
+                    return _to_json({
+                        "success": False,
+                        "error_message": "flight_number or flight_numbers is required"
+                    })
+
+                # Tool arguments are already typed by the tool schema, so skip re-validating each leg
+                flight_legs = [
+                    FlightLeg.model_construct(
+                        operating_carrier_code=operating_carrier,
+                        flight_num=number,
+                        flight_departure_airport_code=departure_airport,
+                        departure_local_date=departure_date,
+                    )
+                    for number in numbers
+                ]
+                logger.debug("%d FlightLegs created for availability check", len(flight_legs))
                 
-                availability_response = await self.client.check_menu_availability(flight_legs=[flight_leg])
-                logger.info(f"TOOL: check_menu_availability completed - Success: {availability_response.success}")
-                return availability_response.model_dump(exclude_none=True)
+                availability_response = await self.client.check_menu_availability(flight_legs=flight_legs)
+                logger.info("TOOL: check_menu_availability completed - Success: %s", availability_response.success)
+                return _to_json(availability_response)
 
             except Exception as e:
-                logger.error(f"TOOL: check_menu_availability failed - {str(e)}", exc_info=True)
-                return {
+                _log_tool_failure("check_menu_availability", e)
+                return _to_json({
                     "success": False,
                     "error_message": str(e)
-                }
+                })
         return check_menu_availability
     
+    @cached_property
     def lookup_flights_tool(self):
-        """Create the flight lookup function tool"""
+        """The flight lookup function tool, built once per MenuTools instance"""
 
         @function_tool
         async def lookup_flights(
@@ -215,7 +488,7 @@ class MenuTools:
                 departure_airport: str,
                 arrival_airport: str,
                 operating_carrier: str = "DL"
-        ) -> Dict[str, Any]:
+        ) -> str:
             """
             Find available flight numbers for a specific route and date. Use this when users
             provide departure/arrival airports and date but no flight number.
@@ -229,12 +502,15 @@ class MenuTools:
             Returns:
                 List of available flights for the route and date
             """
-            logger.info(f"TOOL: lookup_flights called - {departure_airport} to {arrival_airport} on {departure_date}")
+            logger.info("TOOL: lookup_flights called - %s to %s on %s", departure_airport, arrival_airport, departure_date)
+            departure_airport = departure_airport.upper()
+            arrival_airport = arrival_airport.upper()
+            operating_carrier = operating_carrier.upper()
 
             try:
-                dep_date = date.fromisoformat(departure_date)
+                dep_date = _parse_date(departure_date)
                 
-                lookup_request = FlightLookupRequest(
+                lookup_request = FlightLookupRequest.model_construct(
                     departure_date=dep_date,
                     departure_airport=departure_airport,
                     arrival_airport=arrival_airport,
@@ -242,27 +518,25 @@ class MenuTools:
                 )
                 
                 response = await self.client.lookup_flights(lookup_request)
-                logger.info(f"TOOL: lookup_flights completed - Found {len(response.flights)} flights")
+                logger.info("TOOL: lookup_flights completed - Found %d flights", len(response.flights))
                 
-                return {
-                    "query_type": "flight_lookup",
-                    "success": response.success,
-                    "error_message": response.error_message,
-                    "route_info": {
-                        "departure_airport": departure_airport,
-                        "arrival_airport": arrival_airport,
-                        "departure_date": departure_date,
-                        "operating_carrier": operating_carrier
-                    },
-                    "flights": response.flights
-                }
+                return _to_json(FlightRouteLookupResponse.model_construct(
+                    success=response.success,
+                    error_message=response.error_message,
+                    route_info=RouteInfo.model_construct(
+                        departure_airport=departure_airport,
+                        arrival_airport=arrival_airport,
+                        departure_date=departure_date,
+                        operating_carrier=operating_carrier
+                    ),
+                    flights=response.flights
+                ))
 
             except Exception as e:
-                logger.error(f"TOOL: lookup_flights failed - {str(e)}", exc_info=True)
-                return {
-                    "query_type": "flight_lookup",
-                    "success": False,
-                    "error_message": str(e)
-                }
+                _log_tool_failure("lookup_flights", e)
+                return _to_json(FlightRouteLookupResponse.model_construct(
+                    success=False,
+                    error_message=str(e)
+                ))
         
         return lookup_flights
\ No newline at end of file
@@ -1,17 +1,48 @@
+import atexit
 import logging
+import logging.handlers
+import queue
+
+LOG_FILE_MAX_BYTES = 10_000_000
+LOG_FILE_BACKUP_COUNT = 3
+
+
+class _DeferredFormatQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that enqueues records unformatted, leaving formatting to the listener's handlers"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The stock prepare() formats the message on the logging thread; the queue never
+        # leaves this process, so the record can be passed through as-is
+        return record
+
 
 def setup_logging(log_level: str = "INFO", log_file: str = "app.log") -> None:
-    """Configure logging for the application"""
-    logging.basicConfig(
-        level=getattr(logging, log_level.upper()),
-        format='%(asctime)s - %(name)s - %(funcName)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.StreamHandler(),
-            logging.FileHandler(log_file)
-        ]
+    """Configure logging for the application; no-op once the root logger has handlers"""
+    root_logger = logging.getLogger()
+    if root_logger.handlers:
+        return
+
+    # Records are only queued on the calling thread (the event loop); a listener
+    # thread does the formatting and the stream/file writes. Log arguments are
+    # therefore rendered slightly later, so don't mutate them right after logging
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(funcName)s - %(levelname)s - %(message)s')
+    stream_handler = logging.StreamHandler()
+    file_handler = logging.handlers.RotatingFileHandler(
+        log_file, maxBytes=LOG_FILE_MAX_BYTES, backupCount=LOG_FILE_BACKUP_COUNT
     )
+    for handler in (stream_handler, file_handler):
+        handler.setFormatter(formatter)
+
+    log_queue = queue.Queue(-1)
+    listener = logging.handlers.QueueListener(log_queue, stream_handler, file_handler, respect_handler_level=True)
+    listener.start()
+    # Flush whatever is still queued when the process exits
+    atexit.register(listener.stop)
+
+    root_logger.setLevel(getattr(logging, log_level.upper()))
+    root_logger.addHandler(_DeferredFormatQueueHandler(log_queue))
 
 
 def get_logger(name: str) -> logging.Logger:
     """Get a logger instance"""
-    return logging.getLogger(name)
\ No newline at end of file
+    return logging.getLogger(name)
@@ -1,6 +1,7 @@
+from functools import lru_cache
 
 
-
+@lru_cache(maxsize=512)
 def to_camel(string: str) -> str:
-    components = string.split('_')
-    return components[0] + ''.join(x.capitalize() for x in components[1:])
\ No newline at end of file
+    head, *rest = string.split('_')
+    return head + ''.join(map(str.capitalize, rest))
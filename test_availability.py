@@ -3,87 +3,90 @@
 Test script to verify the new menu availability integration
 """
 import asyncio
-import sys
-import os
+from datetime import date, timedelta
 
-# Add src to path for imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
-
-from client.delta_client import DeltaMenuClient
-from tools.menu_tools import MenuTools
+from src.client.delta_client import DeltaMenuClient, close_http_client
+from src.models.menu import FlightLeg
+from src.models.requests import MenuQueryRequest
+from src.utils.logging_config import setup_logging
 
 
 async def test_availability():
     """Test the new availability check functionality"""
     print("🧪 Testing Delta Menu Availability Integration")
     print("=" * 50)
-    
-    # Initialize client and tools
-    client = DeltaMenuClient()
-    tools = MenuTools(client)
-    
+
+    # Menus are published for upcoming flights only
+    request = MenuQueryRequest(
+        departure_date=date.today() + timedelta(days=1),
+        flight_number=30,
+        departure_airport="ATL",
+        operating_carrier="DL"
+    )
+
     try:
-        # Test availability check
-        print("\n1. Testing menu availability check...")
-        availability = await tools.check_flight_menu_availability(
-            departure_date="2025-08-16",
-            flight_number=30,
-            departure_airport="ATL",
-            operating_carrier="DL"
-        )
-        
-        if availability["success"]:
+        async with DeltaMenuClient() as client:
+            # Test availability check
+            print("\n1. Testing menu availability check...")
+            availability = await client.check_menu_availability([FlightLeg(
+                operating_carrier_code=request.operating_carrier,
+                flight_num=request.flight_number,
+                flight_departure_airport_code=request.departure_airport,
+                departure_local_date=request.departure_date.isoformat()
+            )])
+
+            if not availability.success:
+                print(f"❌ Availability check failed: {availability.error_message}")
+                return
+
             print("✅ Availability check successful!")
-            print(f"Flight: {availability['flight_info']['carrier']}{availability['flight_info']['flight_number']}")
-            print(f"Date: {availability['flight_info']['date']}")
-            print(f"From: {availability['flight_info']['flight_departure_airport']}")
+            print(f"Flight: {request.operating_carrier}{request.flight_number}")
+            print(f"Date: {request.departure_date}")
+            print(f"From: {request.departure_airport}")
             print()
-            
+
+            cabins = [cabin for leg in availability.flight_legs for cabin in leg.cabins or ()]
+            available_cabins = [cabin.cabin_type_code for cabin in cabins if cabin.digital_menu_available]
+
             print("📊 Cabin Availability:")
-            for cabin_code, info in availability["availability"].items():
-                status = "✅ Available" if info["digital_menu_available"] else "❌ Not Available"
-                print(f"  {cabin_code} ({info['cabin_name']}): {status}")
-                
+            for cabin in cabins:
+                status = "✅ Available" if cabin.digital_menu_available else "❌ Not Available"
+                print(f"  {cabin.cabin_type_code} ({cabin.cabin_type_desc}): {status}")
+
             print()
-            print(f"📈 Summary: {availability['summary']['available_cabins']} of {availability['summary']['total_cabins']} cabins have digital menus")
-            print(f"🎯 Action: {availability['summary']['recommended_action']}")
-            
+            print(f"📈 Summary: {len(available_cabins)} of {len(cabins)} cabins have digital menus")
+
             # Test conditional menu fetching
-            if availability["summary"]["recommended_action"] == "Fetch menu data":
-                print("\n2. Testing conditional menu fetch...")
-                available_cabins = [
-                    code for code, info in availability["availability"].items() 
-                    if info["digital_menu_available"]
-                ]
-                
-                if available_cabins:
-                    cabin_to_test = available_cabins[0]
-                    print(f"Fetching menu for cabin {cabin_to_test}...")
-                    
-                    menu = await tools.get_cabin_menu(
-                        departure_date="2025-08-16",
-                        flight_number=30,
-                        cabin_code=cabin_to_test,
-                        departure_airport="ATL",
-                        operating_carrier="DL"
-                    )
-                    
-                    if menu["success"]:
-                        print(f"✅ Menu fetched successfully for cabin {cabin_to_test}")
-                        print(f"   Cabin: {menu['cabin']['name']}")
-                        print(f"   Total items: {len(menu['menu']['appetizers']) + len(menu['menu']['entrees']) + len(menu['menu']['desserts']) + len(menu['menu']['beverages'])}")
-                    else:
-                        print(f"❌ Failed to fetch menu: {menu['error_message']}")
-                        
-        else:
-            print(f"❌ Availability check failed: {availability['error_message']}")
-            
+            if not available_cabins:
+                print("🎯 Action: No digital menus to fetch")
+                return
+
+            print("\n2. Testing conditional menu fetch...")
+            cabin_to_test = available_cabins[0]
+            print(f"Fetching menu for cabin {cabin_to_test}...")
+
+            # One menu request returns every cabin's menu services
+            menu = await client.get_menu_by_flight(request)
+            if not menu.success:
+                print(f"❌ Failed to fetch menu: {menu.error_message}")
+                return
+
+            service = next((s for s in menu.menu_services if s.cabin_type_code == cabin_to_test), None)
+            if service is None:
+                print(f"❌ No menu service returned for cabin {cabin_to_test}")
+                return
+
+            print(f"✅ Menu fetched successfully for cabin {cabin_to_test}")
+            print(f"   Cabin: {service.cabin_type_desc}")
+            print(f"   Total items: {sum(len(cabin_menu.menu_items) for cabin_menu in service.menus)}")
+
     except Exception as e:
         print(f"❌ Test failed with error: {e}")
-        
+
     finally:
-        await client.close()
+        await close_http_client()
 
 
 if __name__ == "__main__":
-    asyncio.run(test_availability())
\ No newline at end of file
+    setup_logging()
+    asyncio.run(test_availability())
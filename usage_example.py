@@ -4,138 +4,169 @@ Usage example for the new menu availability integration
 """
 import asyncio
 import sys
-import os
+from datetime import date, timedelta
+from itertools import chain, islice
 
-from src.client.delta_client import DeltaMenuClient
-from src.tools.menu_tools import MenuTools
+from src.client.delta_client import DeltaMenuClient, close_http_client
+from src.models.menu import FlightLeg
+from src.models.requests import MenuQueryRequest
+from src.utils.logging_config import setup_logging
 
-# Add src to path for imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+# Upper bound on concurrent API calls, to stay clear of Delta's rate limiting
+MAX_CONCURRENT_REQUESTS = 10
+# Menus are published for upcoming flights only
+DEPARTURE_DATE = date.today() + timedelta(days=1)
 
 
-async def demonstrate_usage():
+async def _bounded(semaphore, coro):
+    """Await a coroutine while holding a slot of the semaphore"""
+    async with semaphore:
+        return await coro
+
+
+def _flight_leg(departure_date: date, flight_number: int) -> FlightLeg:
+    """Availability leg for a Delta flight departing ATL"""
+    return FlightLeg(
+        operating_carrier_code="DL",
+        flight_num=flight_number,
+        flight_departure_airport_code="ATL",
+        departure_local_date=departure_date.isoformat()
+    )
+
+
+async def demonstrate_usage(client: DeltaMenuClient):
     """Demonstrate the new availability-first workflow"""
     print("🎯 Delta Menu Availability Integration - Usage Example")
     print("=" * 55)
     
-    client = DeltaMenuClient()
-    tools = MenuTools(client)
-    
     try:
         # Example: Smart menu fetching workflow
-        flight_details = {
-            "flight_departure_date": "2025-08-16",
-            "flight_number": 30,
-            "flight_departure_airport": "ATL",
-            "operating_carrier": "DL"
-        }
+        request = MenuQueryRequest(
+            departure_date=DEPARTURE_DATE,
+            flight_number=30,
+            departure_airport="ATL",
+            operating_carrier="DL"
+        )
         
-        print(f"\n🔍 Checking availability for {flight_details['operating_carrier']}{flight_details['flight_number']} on {flight_details['flight_departure_date']}")
+        print(f"\n🔍 Checking availability for {request.operating_carrier}{request.flight_number} on {request.departure_date}")
         
         # Step 1: Check availability first
-        availability = await tools.check_flight_menu_availability(**flight_details)
+        availability = await client.check_menu_availability([_flight_leg(request.departure_date, request.flight_number)])
         
-        if not availability["success"]:
-            print(f"❌ Availability check failed: {availability['error_message']}")
+        if not availability.success:
+            print(f"❌ Availability check failed: {availability.error_message}")
             return
             
         print("\n📋 Availability Results:")
-        available_cabins = []
+        cabins = [
+            (cabin.cabin_type_code, cabin.cabin_type_desc, cabin.digital_menu_available)
+            for leg in availability.flight_legs
+            for cabin in leg.cabins or ()
+        ]
+        available_cabins = [cabin_code for cabin_code, _, available in cabins if available]
         
-        for cabin_code, info in availability["availability"].items():
-            status = "✅ Available" if info["digital_menu_available"] else "❌ Not Available"
-            print(f"  {cabin_code} ({info['cabin_name']}): {status}")
-            
-            if info["digital_menu_available"]:
-                available_cabins.append(cabin_code)
+        for cabin_code, cabin_name, available in cabins:
+            status = "✅ Available" if available else "❌ Not Available"
+            print(f"  {cabin_code} ({cabin_name}): {status}")
         
         print(f"\n📊 Summary: {len(available_cabins)} cabins have digital menus available")
         
         # Step 2: Fetch menus only for available menu_services
-        if available_cabins:
-            print(f"\n🍽️ Fetching menus for available cabins: {', '.join(available_cabins)}")
-            
-            for cabin_code in available_cabins:
-                print(f"\n--- {cabin_code} Class Menu ---")
-                
-                menu = await tools.get_cabin_menu(
-                    departure_date=flight_details["flight_departure_date"],
-                    flight_number=flight_details["flight_number"],
-                    cabin_code=cabin_code,
-                    departure_airport=flight_details["flight_departure_airport"],
-                    operating_carrier=flight_details["operating_carrier"]
-                )
-                
-                if menu["success"]:
-                    print(f"Cabin: {menu['cabin']['name']}")
-                    print(f"Service: {menu['cabin'].get('service_time', 'N/A')}")
-                    
-                    # Show menu highlights
-                    all_items = []
-                    for category, items in menu["menu"].items():
-                        if items:
-                            all_items.extend(items)
-                    
-                    if all_items:
-                        print("Menu Highlights:")
-                        for item in all_items[:3]:  # Top 3 items
-                            print(f"  • {item['name']}")
-                        print(f"  ... and {len(all_items) - 3} more items")
-                    else:
-                        print("No menu items available")
-                else:
-                    print(f"Failed to fetch menu: {menu['error_message']}")
-        else:
+        if not available_cabins:
             print("\n⚠️ No digital menus available for this flight")
+            return
+        
+        print(f"\n🍽️ Fetching menus for available cabins: {', '.join(available_cabins)}")
+        
+        # One menu request returns every cabin's menu services
+        menu = await client.get_menu_by_flight(request)
+        if not menu.success:
+            print(f"Failed to fetch menu: {menu.error_message}")
+            return
+        services = {service.cabin_type_code: service for service in menu.menu_services}
+        
+        # Build the whole menu report and write it to stdout in one call
+        lines = []
+        for cabin_code in available_cabins:
+            lines.append(f"\n--- {cabin_code} Class Menu ---")
+            service = services.get(cabin_code)
+            if service is None:
+                lines.append("No menu service returned for this cabin")
+                continue
+            
+            lines.append(f"Cabin: {service.cabin_type_desc}")
+            lines.append(f"Service: {service.menu_service_meal_time_window or 'N/A'}")
+            
+            # Show menu highlights, taking the top 3 items lazily instead of flattening the whole menu
+            total_items = sum(len(cabin_menu.menu_items) for cabin_menu in service.menus)
+            highlights = list(islice(chain.from_iterable(cabin_menu.menu_items for cabin_menu in service.menus), 3))
+            
+            if highlights:
+                lines.append("Menu Highlights:")
+                lines.extend(f"  • {item.menu_item_desc}" for item in highlights)
+                lines.append(f"  ... and {total_items - len(highlights)} more items")
+            else:
+                lines.append("No menu items available")
+        sys.stdout.write("\n".join(lines) + "\n")
             
     except Exception as e:
         print(f"❌ Error: {e}")
-        
-    finally:
-        await client.close()
 
 
-async def batch_availability_check():
+async def batch_availability_check(client: DeltaMenuClient):
     """Demonstrate checking multiple flights"""
     print("\n" + "=" * 55)
     print("📊 Batch Availability Check Example")
     print("=" * 55)
     
-    client = DeltaMenuClient()
-    tools = MenuTools(client)
-    
     try:
-        # Multiple flights to check
-        flights_to_check = [
-            {"date": "2025-08-16", "number": 30},
-            {"date": "2025-08-16", "number": 996},
-            {"date": "2025-08-16", "number": 444},
-        ]
+        # Multiple flights to check; DL30 was already checked above, so the client answers it from cache
+        flights_to_check = [30, 996, 444]
         
         print("\nChecking availability for multiple flights...")
         
-        for flight in flights_to_check:
-            availability = await tools.check_flight_menu_availability(
-                departure_date=flight["date"],
-                flight_number=flight["number"],
-                departure_airport="ATL",
-                operating_carrier="DL"
-            )
-            
-            if availability["success"]:
-                available_count = availability["summary"]["available_cabins"]
-                total_count = availability["summary"]["total_cabins"]
-                print(f"  DL{flight['number']}: {available_count}/{total_count} cabins available")
+        # Probe all flights concurrently and print each result as soon as it arrives
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        
+        async def check(flight_number):
+            try:
+                return flight_number, await _bounded(
+                    semaphore, client.check_menu_availability([_flight_leg(DEPARTURE_DATE, flight_number)])
+                )
+            except Exception as e:
+                return flight_number, e
+        
+        for next_result in asyncio.as_completed([check(flight_number) for flight_number in flights_to_check]):
+            flight_number, availability = await next_result
+            if isinstance(availability, Exception):
+                print(f"  DL{flight_number}: Error - {availability}")
+            elif availability.success:
+                cabins = [cabin for leg in availability.flight_legs for cabin in leg.cabins or ()]
+                available_count = sum(1 for cabin in cabins if cabin.digital_menu_available)
+                print(f"  DL{flight_number}: {available_count}/{len(cabins)} cabins available")
             else:
-                print(f"  DL{flight['number']}: Error - {availability['error_message']}")
+                print(f"  DL{flight_number}: Error - {availability.error_message}")
                 
     except Exception as e:
         print(f"❌ Batch check failed: {e}")
-        
+
+
+async def main():
+    """Run both demos on one event loop, sharing a single client and its connection pool"""
+    try:
+        async with DeltaMenuClient() as client:
+            await demonstrate_usage(client)
+            await batch_availability_check(client)
     finally:
-        await client.close()
+        await close_http_client()
 
 
 if __name__ == "__main__":
-    asyncio.run(demonstrate_usage())
-    asyncio.run(batch_availability_check())
\ No newline at end of file
+    setup_logging()
+    # Use uvloop's faster event loop when it is installed; it is not a dependency
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    asyncio.run(main())
\ No newline at end of file